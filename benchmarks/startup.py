@@ -0,0 +1,232 @@
+"""Startup benchmark for GitUpdater
+
+Measures how long each package takes to import (as reported by python -X importtime)
+and the time until the main window and tray icon are up in GUI mode, or until the
+update engine is ready in headless mode. Every sample runs in a fresh interpreter
+with an empty config directory and the offscreen Qt platform, the median of all
+runs is reported.
+
+    python benchmarks/startup.py                  print a report
+    python benchmarks/startup.py --check          fail if slower than startup_baseline.json
+    python benchmarks/startup.py --save-baseline  record the current numbers as baseline
+
+Baselines depend on the machine, record one on the machine that runs --check. The
+build workflow runs --check with a wide tolerance, so there it only catches large
+slowdowns and headless startup importing packages it must not.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json')
+
+GUI_MODULE = 'src.mainwindow'
+HEADLESS_MODULE = 'src.asyncengine'
+# Packages the headless engine must never import
+GUI_ONLY_PACKAGES = ('PyQt6', 'apscheduler')
+# Packages the headless engine imports once it runs, not while starting up
+DEFERRED_PACKAGES = ('aiohttp',)
+
+# A metric regresses when it exceeds baseline * (1 + tolerance) + slack
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_SLACK_MS = 25.0
+
+GUI_PROBE = """
+import os, sys, json, time
+start = time.perf_counter()
+from PyQt6 import QtWidgets
+app = QtWidgets.QApplication(sys.argv)
+from components.trayicon import SystemTrayIcon
+marks = {}
+show_tray = SystemTrayIcon.show
+def timed_show(self):
+    show_tray(self)
+    marks.setdefault('tray_ms', (time.perf_counter() - start) * 1000)
+SystemTrayIcon.show = timed_show
+from src.mainwindow import MainWindow
+marks['import_ms'] = (time.perf_counter() - start) * 1000
+window = MainWindow()
+window.show()
+app.processEvents()
+marks['window_ms'] = (time.perf_counter() - start) * 1000
+print(json.dumps(marks), flush=True)
+# Update check threads may still be running, skip the Qt teardown
+os._exit(0)
+"""
+
+HEADLESS_PROBE = f"""
+import os, sys, json, time
+unexpected = {GUI_ONLY_PACKAGES + DEFERRED_PACKAGES!r}
+start = time.perf_counter()
+from src.asyncengine import run_async_updates
+from src.utils import get_config_path, load_github_token
+marks = {{'import_ms': (time.perf_counter() - start) * 1000}}
+modules = {{name.split('.')[0] for name in sys.modules if name.startswith(unexpected)}}
+marks['unexpected_modules'] = sorted(modules)
+print(json.dumps(marks), flush=True)
+"""
+
+
+def probe_env(config_dir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        'XDG_CONFIG_HOME': config_dir,
+        'QT_QPA_PLATFORM': 'offscreen',
+        'GITHUB_ACCESS_TOKEN': env.get('GITHUB_ACCESS_TOKEN', 'startup-benchmark'),
+        'PYTHONDONTWRITEBYTECODE': '1',
+    })
+    return env
+
+
+def run_probe(code: str, config_dir: str) -> dict:
+    """Run code in a new interpreter, returns its JSON output plus the process wall time"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=config_dir, env=probe_env(config_dir),
+        capture_output=True, text=True, timeout=120
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr.strip()}")
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+    marks['process_ms'] = elapsed
+    return marks
+
+
+def import_times(module: str, config_dir: str) -> dict:
+    """Self import time per top-level package in ms, parsed from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=config_dir,
+        env={**probe_env(config_dir), 'PYTHONPATH': ROOT},
+        capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()}")
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+    return packages
+
+
+def median_marks(samples: list) -> dict:
+    keys = [key for key, value in samples[0].items() if isinstance(value, (int, float))]
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in keys}
+
+
+def measure(runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        # Probes import the app from the checkout but run from the empty config directory
+        python_path = [ROOT, os.environ.get('PYTHONPATH')]
+        os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, python_path))
+        samples, errors = {}, {}
+        for mode, code in (('gui', GUI_PROBE), ('headless', HEADLESS_PROBE)):
+            try:
+                samples[mode] = [run_probe(code, config_dir) for _ in range(runs)]
+            except RuntimeError as e:
+                errors[mode] = str(e)
+        packages = {
+            'gui': import_times(GUI_MODULE, config_dir),
+            'headless': import_times(HEADLESS_MODULE, config_dir),
+        }
+
+    metrics = {}
+    for mode, mode_samples in samples.items():
+        for key, value in median_marks(mode_samples).items():
+            metrics[f'{mode}.{key}'] = value
+    unexpected = samples['headless'][0]['unexpected_modules'] if 'headless' in samples else []
+    slowest = {}
+    for mode, times in packages.items():
+        ranked = sorted(times.items(), key=lambda item: -item[1])[:15]
+        slowest[mode] = {name: round(ms, 1) for name, ms in ranked}
+    return {
+        'metrics': metrics,
+        'errors': errors,
+        'headless_unexpected_modules': unexpected,
+        'packages': slowest,
+    }
+
+
+def print_report(result: dict, baseline: dict = None):
+    baseline_metrics = (baseline or {}).get('metrics', {})
+    print('Startup times (median, ms)')
+    for key, value in result['metrics'].items():
+        line = f'  {key:<24}{value:>10.1f}'
+        if key in baseline_metrics:
+            line += f'   baseline {baseline_metrics[key]:>8.1f}'
+        print(line)
+    for mode, error in result['errors'].items():
+        print(f'{mode} startup failed: {error.splitlines()[-1]}')
+    for mode, packages in result['packages'].items():
+        print(f'Slowest imports for {mode} (self time, ms)')
+        for name, ms in packages.items():
+            print(f'  {name:<24}{ms:>10.1f}')
+
+
+def find_regressions(result: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    regressions = [f'{mode} startup failed' for mode in result['errors']]
+    if result['headless_unexpected_modules']:
+        modules = ', '.join(result['headless_unexpected_modules'])
+        regressions.append(f"headless startup imports {modules}")
+    for key, limit in baseline['metrics'].items():
+        value = result['metrics'].get(key)
+        if value is not None and value > limit * (1 + tolerance) + slack_ms:
+            regressions.append(f'{key} took {value:.1f} ms, baseline {limit:.1f} ms')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GitUpdater startup benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Samples per mode")
+    parser.add_argument(
+        '--check', action='store_true', help="Fail when slower than the baseline"
+    )
+    parser.add_argument(
+        '--save-baseline', action='store_true', help="Store the results as the new baseline"
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown"
+    )
+    parser.add_argument(
+        '--slack', type=float, default=DEFAULT_SLACK_MS, help="Allowed absolute slowdown in ms"
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    result = measure(args.runs)
+    print_report(result, baseline)
+
+    if args.save_baseline:
+        # Modes that failed to start have no metrics and are not guarded until they work again
+        saved = {key: value for key, value in result.items() if key != 'errors'}
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=4)
+            f.write('\n')
+        print(f'Baseline written to {BASELINE_PATH}')
+
+    if args.check:
+        if baseline is None:
+            print('No baseline found, run with --save-baseline first')
+            return 1
+        regressions = find_regressions(result, baseline, args.tolerance, args.slack)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
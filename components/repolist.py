@@ -0,0 +1,95 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QRectF, QSize, Qt
+from PyQt6.QtGui import QColor, QPainter, QPainterPath
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+
+class RepoListModel(QAbstractListModel):
+    """Repositories of the repo store as rows of a list view
+
+    set_repos compares the new list with the current rows and only emits
+    rowsRemoved, rowsInserted and dataChanged for the rows that differ, so a
+    rename or version bump repaints one row instead of rebuilding the list.
+    """
+    UrlRole = Qt.ItemDataRole.UserRole + 1
+    RepoRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._repos = []
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._repos)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._repos):
+            return None
+        repo = self._repos[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return repo['name']
+        if role in (Qt.ItemDataRole.ToolTipRole, self.UrlRole):
+            return repo['url']
+        if role == self.RepoRole:
+            return dict(repo)
+        return None
+
+    def repo_name(self, index) -> str:
+        return self.data(index, Qt.ItemDataRole.DisplayRole)
+
+    def set_repos(self, repos: list):
+        """Make the rows match repos, keyed by repository name"""
+        names = {repo['name'] for repo in repos}
+        for row in reversed(range(len(self._repos))):
+            if self._repos[row]['name'] not in names:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._repos[row]
+                self.endRemoveRows()
+
+        # The store keeps its order, so the remaining rows are already in place
+        # and only new repositories need to be inserted between them
+        for row, repo in enumerate(repos):
+            if row < len(self._repos) and self._repos[row]['name'] == repo['name']:
+                if self._repos[row] != repo:
+                    self._repos[row] = dict(repo)
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._repos.insert(row, dict(repo))
+                self.endInsertRows()
+
+        if len(self._repos) > len(repos):
+            # Left over from a reordered list
+            self.beginRemoveRows(QModelIndex(), len(repos), len(self._repos) - 1)
+            del self._repos[len(repos):]
+            self.endRemoveRows()
+
+
+class RepoItemDelegate(QStyledItemDelegate):
+    """Paints a repository row like the flat rounded buttons used elsewhere in the app"""
+    ROW_HEIGHT = 40
+    SPACING = 6
+    BACKGROUND = QColor(57, 62, 70)
+    HOVER_BACKGROUND = QColor(47, 52, 60)
+
+    def paint(self, painter: QPainter, option, index):
+        rect = QRectF(option.rect.adjusted(0, 0, 0, -self.SPACING))
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 5, 5)
+        painter.fillPath(path, self.HOVER_BACKGROUND if hovered else self.BACKGROUND)
+
+        painter.setPen(QColor('#FFFFFF'))
+        painter.setFont(option.font)
+        text = option.fontMetrics.elidedText(
+            index.data(), Qt.TextElideMode.ElideRight, int(rect.width()) - 20
+        )
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.SPACING)
@@ -0,0 +1,285 @@
+# Form implementation generated from reading ui file 'components/mainwindow.ui'
+#
+# Created by: PyQt6 UI code generator 6.10.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(800, 600)
+        MainWindow.setMinimumSize(QtCore.QSize(800, 600))
+        font = QtGui.QFont()
+        font.setFamily("Roboto")
+        MainWindow.setFont(font)
+        MainWindow.setAutoFillBackground(False)
+        MainWindow.setStyleSheet("")
+        self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
+        self.centralwidget.setStyleSheet("")
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setSpacing(0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.header = QtWidgets.QFrame(parent=self.centralwidget)
+        self.header.setMaximumSize(QtCore.QSize(16777215, 60))
+        self.header.setStyleSheet("background-color: rgb(34, 40, 49);")
+        self.header.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.header.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.header.setObjectName("header")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.header)
+        self.horizontalLayout_2.setContentsMargins(5, 5, 5, 5)
+        self.horizontalLayout_2.setSpacing(5)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.frame = QtWidgets.QFrame(parent=self.header)
+        self.frame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.frame.setLineWidth(0)
+        self.frame.setObjectName("frame")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.frame)
+        self.horizontalLayout_3.setContentsMargins(5, 0, 0, 0)
+        self.horizontalLayout_3.setSpacing(5)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.headerIcon = QtWidgets.QFrame(parent=self.frame)
+        self.headerIcon.setMaximumSize(QtCore.QSize(60, 60))
+        self.headerIcon.setStyleSheet("image: url(:/assets/giticon.svg);")
+        self.headerIcon.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.headerIcon.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.headerIcon.setLineWidth(0)
+        self.headerIcon.setObjectName("headerIcon")
+        self.horizontalLayout_3.addWidget(self.headerIcon)
+        self.headerLabel = QtWidgets.QLabel(parent=self.frame)
+        font = QtGui.QFont()
+        font.setFamily("Roboto")
+        font.setPointSize(24)
+        font.setBold(True)
+        self.headerLabel.setFont(font)
+        self.headerLabel.setObjectName("headerLabel")
+        self.horizontalLayout_3.addWidget(self.headerLabel)
+        self.horizontalLayout_3.setStretch(0, 1)
+        self.horizontalLayout_3.setStretch(1, 2)
+        self.horizontalLayout_2.addWidget(self.frame)
+        self.settingsButton = QtWidgets.QPushButton(parent=self.header)
+        self.settingsButton.setMinimumSize(QtCore.QSize(0, 48))
+        self.settingsButton.setMaximumSize(QtCore.QSize(48, 48))
+        self.settingsButton.setToolTip("")
+        self.settingsButton.setStyleSheet("QPushButton {\n"
+"                                            border: 1px solid transparent; /* Invisible border */\n"
+"                                            background-color: rgb(34, 40, 49); /* Match parent background */\n"
+"                                            border-radius: 5px; /* Optional: round the corners */\n"
+"                                            image: url(:/assets/settingsicon.svg); /* Add the icon */\n"
+"                                            background-position: center; /* Center the icon */\n"
+"                                            background-repeat: no-repeat; /* Prevent tiling */\n"
+"                                            }\n"
+"\n"
+"                                            QPushButton:hover {\n"
+"                                            background-color: rgb(40, 46, 55); /* Slightly lighter */\n"
+"                                            }\n"
+"\n"
+"                                            QPushButton:pressed {\n"
+"                                            background-color: rgb(30, 35, 43); /* Slightly darker */\n"
+"                                            padding-left: 1px; /* Optional: slight shift */\n"
+"                                            padding-top: 1px;\n"
+"                                            }\n"
+"                                        ")
+        self.settingsButton.setText("")
+        self.settingsButton.setIconSize(QtCore.QSize(48, 48))
+        self.settingsButton.setObjectName("settingsButton")
+        self.horizontalLayout_2.addWidget(self.settingsButton)
+        self.horizontalLayout_2.setStretch(1, 1)
+        self.verticalLayout.addWidget(self.header)
+        self.interactionFrame = QtWidgets.QFrame(parent=self.centralwidget)
+        self.interactionFrame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.interactionFrame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.interactionFrame.setLineWidth(0)
+        self.interactionFrame.setObjectName("interactionFrame")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.interactionFrame)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setSpacing(0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.repoButtonFrame = QtWidgets.QFrame(parent=self.interactionFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.repoButtonFrame.sizePolicy().hasHeightForWidth())
+        self.repoButtonFrame.setSizePolicy(sizePolicy)
+        self.repoButtonFrame.setMaximumSize(QtCore.QSize(300, 16777215))
+        self.repoButtonFrame.setStyleSheet("background-color: rgb(123, 199, 77);")
+        self.repoButtonFrame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.repoButtonFrame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.repoButtonFrame.setLineWidth(0)
+        self.repoButtonFrame.setObjectName("repoButtonFrame")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.repoButtonFrame)
+        self.verticalLayout_2.setContentsMargins(5, 5, 5, 5)
+        self.verticalLayout_2.setSpacing(10)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.repoButtonFrameLabel = QtWidgets.QLabel(parent=self.repoButtonFrame)
+        font = QtGui.QFont()
+        font.setFamily("Roboto")
+        font.setPointSize(20)
+        font.setBold(True)
+        self.repoButtonFrameLabel.setFont(font)
+        self.repoButtonFrameLabel.setStyleSheet("background-color: rgb(57, 62, 70);\n"
+"                                                        border-radius: 5px;\n"
+"                                                    ")
+        self.repoButtonFrameLabel.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.repoButtonFrameLabel.setObjectName("repoButtonFrameLabel")
+        self.verticalLayout_2.addWidget(self.repoButtonFrameLabel)
+        self.seperatorRepos = QtWidgets.QFrame(parent=self.repoButtonFrame)
+        self.seperatorRepos.setMaximumSize(QtCore.QSize(16777215, 1))
+        self.seperatorRepos.setStyleSheet("background-color: rgb(217, 217, 217);")
+        self.seperatorRepos.setFrameShape(QtWidgets.QFrame.Shape.HLine)
+        self.seperatorRepos.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.seperatorRepos.setObjectName("seperatorRepos")
+        self.verticalLayout_2.addWidget(self.seperatorRepos)
+        self.repoListView = QtWidgets.QListView(parent=self.repoButtonFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.repoListView.sizePolicy().hasHeightForWidth())
+        self.repoListView.setSizePolicy(sizePolicy)
+        self.repoListView.setMinimumSize(QtCore.QSize(157, 0))
+        self.repoListView.setMouseTracking(True)
+        self.repoListView.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+        self.repoListView.setStyleSheet("background-color:")
+        self.repoListView.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.repoListView.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.repoListView.setLineWidth(0)
+        self.repoListView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.repoListView.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.repoListView.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.repoListView.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.repoListView.setUniformItemSizes(True)
+        self.repoListView.setObjectName("repoListView")
+        self.verticalLayout_2.addWidget(self.repoListView)
+        self.addRepoButton = QtWidgets.QPushButton(parent=self.repoButtonFrame)
+        self.addRepoButton.setStyleSheet("background-color: rgb(57, 62, 70);")
+        self.addRepoButton.setObjectName("addRepoButton")
+        self.verticalLayout_2.addWidget(self.addRepoButton)
+        self.horizontalLayout.addWidget(self.repoButtonFrame)
+        self.updatesFrame = QtWidgets.QFrame(parent=self.interactionFrame)
+        self.updatesFrame.setStyleSheet("background-color: rgb(57, 62, 70);")
+        self.updatesFrame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.updatesFrame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.updatesFrame.setLineWidth(0)
+        self.updatesFrame.setObjectName("updatesFrame")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.updatesFrame)
+        self.verticalLayout_3.setContentsMargins(25, 20, 25, 20)
+        self.verticalLayout_3.setSpacing(0)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.updatesDataFrame = QtWidgets.QFrame(parent=self.updatesFrame)
+        self.updatesDataFrame.setStyleSheet("background-color: rgb(123, 199, 77);\n"
+"                                                        border-radius: 8px;\n"
+"                                                    ")
+        self.updatesDataFrame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.updatesDataFrame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.updatesDataFrame.setLineWidth(0)
+        self.updatesDataFrame.setObjectName("updatesDataFrame")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.updatesDataFrame)
+        self.verticalLayout_4.setContentsMargins(10, 10, 10, 10)
+        self.verticalLayout_4.setSpacing(10)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.updatesLabelFrame = QtWidgets.QFrame(parent=self.updatesDataFrame)
+        self.updatesLabelFrame.setMinimumSize(QtCore.QSize(0, 0))
+        self.updatesLabelFrame.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.updatesLabelFrame.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.updatesLabelFrame.setLineWidth(0)
+        self.updatesLabelFrame.setObjectName("updatesLabelFrame")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.updatesLabelFrame)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setSpacing(5)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.updatedLabel = QtWidgets.QLabel(parent=self.updatesLabelFrame)
+        font = QtGui.QFont()
+        font.setFamily("Roboto")
+        font.setPointSize(28)
+        font.setBold(True)
+        self.updatedLabel.setFont(font)
+        self.updatedLabel.setStyleSheet("background-color: rgb(57, 62, 70);\n"
+"                                                                    border-radius: 5px;\n"
+"                                                                ")
+        self.updatedLabel.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.updatedLabel.setObjectName("updatedLabel")
+        self.verticalLayout_5.addWidget(self.updatedLabel)
+        self.seperatorUpdates = QtWidgets.QFrame(parent=self.updatesLabelFrame)
+        self.seperatorUpdates.setMinimumSize(QtCore.QSize(0, 0))
+        self.seperatorUpdates.setMaximumSize(QtCore.QSize(16777215, 1))
+        self.seperatorUpdates.setStyleSheet("background-color: rgb(217, 217,\n"
+"                                                                    217);\n"
+"                                                                ")
+        self.seperatorUpdates.setFrameShape(QtWidgets.QFrame.Shape.HLine)
+        self.seperatorUpdates.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.seperatorUpdates.setObjectName("seperatorUpdates")
+        self.verticalLayout_5.addWidget(self.seperatorUpdates)
+        self.updatesView = QtWidgets.QTableView(parent=self.updatesLabelFrame)
+        self.updatesView.setMouseTracking(True)
+        self.updatesView.setStyleSheet("QTableView {\n"
+"    background-color: rgb(57, 62, 70);\n"
+"    border-radius: 5px;\n"
+"    color: white;\n"
+"}\n"
+"QHeaderView::section {\n"
+"    background-color: rgb(57, 62, 70);\n"
+"    color: white;\n"
+"    border: 0;\n"
+"    border-bottom: 1px solid #ccc;\n"
+"    padding: 4px;\n"
+"}\n"
+"QToolTip {\n"
+"    background-color: rgb(57, 62, 70);\n"
+"    border: 1px solid #ccc;\n"
+"}")
+        self.updatesView.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.updatesView.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.updatesView.setLineWidth(0)
+        self.updatesView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.updatesView.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.updatesView.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.updatesView.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.updatesView.setShowGrid(False)
+        self.updatesView.setSortingEnabled(True)
+        self.updatesView.setWordWrap(False)
+        self.updatesView.setObjectName("updatesView")
+        self.updatesView.horizontalHeader().setHighlightSections(False)
+        self.updatesView.verticalHeader().setVisible(False)
+        self.verticalLayout_5.addWidget(self.updatesView)
+        self.refreshButton = QtWidgets.QPushButton(parent=self.updatesLabelFrame)
+        self.refreshButton.setStyleSheet("QPushButton {\n"
+"   background-color: rgb(57, 62, 70);\n"
+"   border: none;\n"
+"   color: #FFFFFF;\n"
+"   text-align: center;\n"
+"   border-radius: 5px;\n"
+"}\n"
+"QPushButton:hover {\n"
+"    background-color: rgb(47, 52, 60);\n"
+" }")
+        self.refreshButton.setObjectName("refreshButton")
+        self.verticalLayout_5.addWidget(self.refreshButton)
+        self.verticalLayout_4.addWidget(self.updatesLabelFrame)
+        self.verticalLayout_3.addWidget(self.updatesDataFrame)
+        self.horizontalLayout.addWidget(self.updatesFrame)
+        self.horizontalLayout.setStretch(1, 6)
+        self.verticalLayout.addWidget(self.interactionFrame)
+        self.verticalLayout.setStretch(0, 1)
+        self.verticalLayout.setStretch(1, 10)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "GitUpdater"))
+        self.headerLabel.setText(_translate("MainWindow", "GitUpdater"))
+        self.settingsButton.setWhatsThis(_translate("MainWindow", "SettingsButton"))
+        self.settingsButton.setAccessibleName(_translate("MainWindow", "Settings Button"))
+        self.repoButtonFrameLabel.setText(_translate("MainWindow", "Repositories"))
+        self.addRepoButton.setText(_translate("MainWindow", "Add Repo"))
+        self.updatedLabel.setText(_translate("MainWindow", "Updates"))
+        self.refreshButton.setText(_translate("MainWindow", "Refresh"))
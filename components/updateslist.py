@@ -0,0 +1,182 @@
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QRectF,
+    QSize,
+    QSortFilterProxyModel,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QPainter, QPainterPath
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+
+def format_size(size: int) -> str:
+    """Human readable size of an asset in bytes"""
+    if not size:
+        return 'N/A'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+
+
+class UpdatesModel(QAbstractTableModel):
+    """Pending updates as table rows, keyed by repository name
+
+    add_update inserts a row or refreshes the existing row of the same
+    repository, so rows appear one by one while a check runs instead of the
+    whole panel being rebuilt. SortRole holds raw values for sorting.
+    """
+    NAME, VERSION, SIZE, RELEASED, ACTION = range(5)
+    HEADERS = ('Repository', 'Version', 'Size', 'Released', '')
+    SortRole = Qt.ItemDataRole.UserRole + 1
+    UpdateRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._updates = []
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._updates)
+
+    def columnCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._updates):
+            return None
+        update = self._updates[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.NAME:
+                return update['name']
+            if column == self.VERSION:
+                return f"{update['old_version']} -> {update['new_version']}"
+            if column == self.SIZE:
+                return format_size(update.get('size'))
+            if column == self.RELEASED:
+                return update['updated_at'].split(' ')[0]
+            if column == self.ACTION:
+                return 'Update'
+        elif role == self.SortRole:
+            if column == self.SIZE:
+                return update.get('size') or 0
+            if column == self.RELEASED:
+                return update['updated_at']
+            return update['name'].lower()
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return (
+                f"{update.get('correct_package_name')}\nReleased {update['updated_at']}"
+                f"\nChecked {update['checked_at']}"
+            )
+        elif role == self.UpdateRole:
+            return dict(update)
+        return None
+
+    def row_of(self, name: str) -> int:
+        for row, update in enumerate(self._updates):
+            if update['name'] == name:
+                return row
+        return -1
+
+    def names(self) -> set:
+        return {update['name'] for update in self._updates}
+
+    def add_update(self, update: dict):
+        row = self.row_of(update['name'])
+        if row >= 0:
+            self._updates[row] = dict(update)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+            return
+        row = len(self._updates)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._updates.append(dict(update))
+        self.endInsertRows()
+
+    def remove_update(self, name: str):
+        row = self.row_of(name)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._updates[row]
+        self.endRemoveRows()
+
+    def rename(self, old_name: str, new_name: str):
+        row = self.row_of(old_name)
+        if row < 0:
+            return
+        self._updates[row]['name'] = new_name
+        index = self.index(row, self.NAME)
+        self.dataChanged.emit(index, index)
+
+
+class UpdatesProxyModel(QSortFilterProxyModel):
+    """Sorts the updates by the raw name, size or date of a column"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(UpdatesModel.SortRole)
+        self.setDynamicSortFilter(True)
+
+
+class UpdatesDelegate(QStyledItemDelegate):
+    """Paints update rows and the Update button
+
+    Clicking the button emits update_requested with the row's update data.
+    """
+    update_requested = pyqtSignal(dict)
+
+    ROW_HEIGHT = 40
+    BACKGROUND = QColor(57, 62, 70)
+    BUTTON_HOVER = QColor(47, 52, 60)
+    BORDER = QColor('#cccccc')
+    TEXT = QColor('#FFFFFF')
+
+    def button_rect(self, rect) -> QRectF:
+        return QRectF(rect.adjusted(6, 6, -6, -6))
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.fillRect(option.rect, self.BACKGROUND)
+        painter.setFont(option.font)
+        painter.setPen(self.TEXT)
+        text = index.data()
+        if index.column() == UpdatesModel.ACTION:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            rect = self.button_rect(option.rect)
+            path = QPainterPath()
+            path.addRoundedRect(rect, 5, 5)
+            if option.state & QStyle.StateFlag.State_MouseOver:
+                painter.fillPath(path, self.BUTTON_HOVER)
+            painter.setPen(self.BORDER)
+            painter.drawPath(path)
+            painter.setPen(self.TEXT)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        else:
+            rect = option.rect.adjusted(8, 0, -8, 0)
+            text = option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, rect.width())
+            painter.drawText(rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        width = option.fontMetrics.horizontalAdvance(index.data() or '') + 24
+        return QSize(width, self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):
+        if (index.column() == UpdatesModel.ACTION and event.type() == QEvent.Type.MouseButtonRelease
+                and self.button_rect(option.rect).contains(event.position())):
+            self.update_requested.emit(index.data(UpdatesModel.UpdateRole))
+            return True
+        return super().editorEvent(event, model, option, index)
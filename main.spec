@@ -2,7 +2,6 @@
 block_cipher = None
 
 added_files = [
-    ('components/*.ui', 'components'),  # UI files
     ('assets/*', 'assets'),  # Assets/resources
     ('src/*', 'src'),  # Source files
     ('requirements.txt', '.'), # Requirements file
@@ -13,7 +12,6 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('components/*.ui', 'components'),
         ('assets/*', 'assets'), 
         ('src/config_template.json', 'src'),
         ('requirements.txt', '.'),
@@ -23,7 +21,6 @@ a = Analysis(
         'PyQt6.QtCore',
         'PyQt6.QtGui', 
         'PyQt6.QtWidgets',
-        'PyQt6.uic',
         'dotenv',
         'PyQt6.QtWaylandClient'  # Remove XCB, keep Wayland
     ],
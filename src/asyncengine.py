@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+import platform
+
+from src.blobcache import DEFAULT_CACHE_SIZE_MB, BlobCache
+from src.downloads import DEFAULT_SEGMENT_THRESHOLD_MB, Downloader
+from src.httpcache import HttpCache
+from src.releases import (
+    API_URL,
+    GRAPHQL_BATCH_SIZE,
+    GRAPHQL_URL,
+    Release,
+    build_release_query,
+    filter_platform_assets,
+    find_expected_sha256,
+    get_release_version,
+    match_package_name,
+    parse_release_batch,
+    repo_full_name,
+)
+from src.utils import get_config_dir, get_config_path, get_setting, open_repo_store
+from src.zsync import find_zsync_asset
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+# Total connections of the shared pool and connections to a single host
+DEFAULT_CONNECTION_LIMIT = 32
+DEFAULT_PER_HOST_LIMIT = 8
+# Seconds an API request may take, other requests are only limited while connecting or stalled
+API_TIMEOUT = 30
+CONNECT_TIMEOUT = 30
+READ_TIMEOUT = 60
+
+
+class AsyncUpdateEngine():
+    """Check and install updates of all auto_update repos concurrently without Qt
+
+    Release checks of all repos share one connection pool limited per host.
+    Downloads run the same Downloader as the GUI on worker threads, so the
+    download cache, zsync deltas, segmented downloads and streamed extraction
+    are used here too and downloads of different repos overlap.
+    """
+
+    def __init__(self, token: str, repos_path: str,
+                 connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT, blob_cache: BlobCache = None,
+                 segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD_MB * 1024 * 1024):
+        self.token = token
+        self.blob_cache = blob_cache
+        self.segment_threshold = segment_threshold
+        self.repos_path = repos_path
+        self.repo_store = open_repo_store(repos_path)
+        self.connection_limit = connection_limit
+        self.per_host_limit = per_host_limit
+        self.api_headers = {'Authorization': f'bearer {token}'}
+        self.current_os = platform.system().lower()
+        self.http_cache = HttpCache(os.path.join(get_config_dir(), 'http_cache'), None)
+        # Set when the session is created, aiohttp is only imported then
+        self.api_timeout = None
+
+    async def run(self) -> int:
+        repos = []
+        for repo in self.repo_store.repos():
+            if repo.get('auto_update'):
+                repos.append(repo)
+            else:
+                logger.info(f"Auto update disabled for {repo['name']}. Skipping")
+
+        # Imported here, aiohttp alone takes longer to import than the rest of headless startup
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit, limit_per_host=self.per_host_limit
+        )
+        # No total limit for requests without a timeout of their own, only stalls are cut off
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        )
+        self.api_timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            releases = await self.get_latest_releases(session, [repo['url'] for repo in repos])
+            results = await asyncio.gather(
+                *(self.update_repo(session, repo, releases) for repo in repos),
+                return_exceptions=True
+            )
+
+        failed = False
+        for repo, result in zip(repos, results, strict=True):
+            if isinstance(result, Exception):
+                failed = True
+                logger.error(f"Error updating {repo['name']}: {result}")
+                self.repo_store.record_check(repo['name'], repo['version'], error=str(result))
+
+        for repo, result in zip(repos, results, strict=True):
+            if result is True:
+                self.repo_store.update(repo['name'], version=repo['version'])
+        self.repo_store.flush()
+        logger.info("All updates completed")
+        logger.info(f"HTTP cache stats: {self.http_cache.stats()}")
+        return 1 if failed else 0
+
+    async def get_latest_releases(self, session, repo_urls: list) -> dict:
+        """Batched GraphQL lookup, see GitHub.get_latest_releases"""
+        releases = {}
+        names_by_url = {}
+        for repo_url in repo_urls:
+            try:
+                names_by_url[repo_url] = repo_full_name(repo_url)
+            except IndexError:
+                logger.error(f"Invalid repository URL: {repo_url}")
+        repo_names = sorted(set(names_by_url.values()))
+        batches = [
+            repo_names[i:i + GRAPHQL_BATCH_SIZE]
+            for i in range(0, len(repo_names), GRAPHQL_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._query_release_batch(session, batch) for batch in batches),
+            return_exceptions=True
+        )
+        by_name = {}
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"GraphQL release query failed: {result}")
+                continue
+            by_name.update(result)
+        for repo_url, repo_name in names_by_url.items():
+            if repo_name in by_name:
+                releases[repo_url] = by_name[repo_name]
+        return releases
+
+    async def _query_release_batch(self, session, batch: list) -> dict:
+        logger.info(f"Getting latest releases for {len(batch)} repositories via GraphQL")
+        query, variables = build_release_query(batch)
+        payload = {'query': query, 'variables': variables}
+        async with session.post(
+            GRAPHQL_URL, json=payload, headers=self.api_headers, timeout=self.api_timeout
+        ) as response:
+            response.raise_for_status()
+            result = await response.json()
+
+        for error in result.get('errors') or []:
+            logger.warning(f"GraphQL error: {error.get('message')}")
+        return parse_release_batch(result, batch)
+
+    async def get_latest_release(self, session, repo_url: str):
+        """REST lookup revalidated against the on-disk HTTP cache"""
+        try:
+            url = f'{API_URL}/repos/{repo_full_name(repo_url)}/releases/latest'
+        except IndexError:
+            logger.error(f"Invalid repository URL: {repo_url}")
+            return None
+        entry, headers = self.http_cache.revalidate(url, self.api_headers)
+        async with session.get(url, headers=headers, timeout=self.api_timeout) as response:
+            if self.http_cache.not_modified(entry, response.status):
+                return Release.from_rest(entry['body'])
+            if response.status == 404:
+                logger.error(f"Latest release not found for {repo_url}")
+                return None
+            response.raise_for_status()
+            body = await response.json()
+            self.http_cache.update(url, response.headers, body)
+            return Release.from_rest(body)
+
+    def select_asset(self, repo: dict, latest_release):
+        """Pick the asset to install without user interaction"""
+        assets = filter_platform_assets(latest_release.get_assets(), self.current_os)
+        if repo.get('correct_package_name'):
+            asset = match_package_name(assets, repo['correct_package_name'])
+            if asset:
+                return asset
+        if len(assets) == 1:
+            return assets[0]
+        if assets:
+            logger.warning(
+                f"Multiple packages found for {repo['name']}, select one in the GUI first"
+            )
+        else:
+            logger.error(f"No assets found for {repo['name']} on the current OS")
+        return None
+
+    async def update_repo(self, session, repo: dict, releases: dict) -> bool:
+        """Install the latest release of repo if it is newer, returns whether repo was modified"""
+        logger.info(f"Checking update for {repo['name']}")
+        stored = False
+        if repo['url'] in releases:
+            latest_release = releases[repo['url']]
+        else:
+            try:
+                latest_release = await self.get_latest_release(session, repo['url'])
+            except Exception as e:
+                # Offline or rate limited, fall back to the release stored by an earlier run
+                latest_release = self.repo_store.get_release(repo['url'])
+                if latest_release is None:
+                    raise
+                logger.warning(
+                    f"Using the stored release of {repo['name']}, the lookup failed: {e}"
+                )
+                stored = True
+        if not latest_release:
+            logger.info(f"No release found for {repo['name']}. Skipping")
+            return False
+        if not stored:
+            self.repo_store.save_release(repo['url'], latest_release)
+
+        asset = self.select_asset(repo, latest_release)
+        if not asset:
+            return False
+        version = get_release_version(asset, latest_release)
+        self.repo_store.record_check(repo['name'], repo['version'], version)
+        if version == repo['version']:
+            return False
+
+        sha256, checksum_url = find_expected_sha256(asset, latest_release.get_assets())
+        zsync_asset = find_zsync_asset(asset, latest_release.get_assets())
+        downloader = Downloader(
+            asset.browser_download_url,
+            repo['path'],
+            self.segment_threshold,
+            expected_sha256=sha256,
+            checksum_url=checksum_url,
+            blob_cache=self.blob_cache,
+            zsync_url=zsync_asset.browser_download_url if zsync_asset else None,
+            on_progress=self.progress_logger(repo['name'])
+        )
+        # Blocking I/O on a worker thread, other repos keep checking and downloading meanwhile
+        await asyncio.to_thread(downloader.run)
+        repo['version'] = version
+        logger.info(f"Updated {repo['name']} to {version}")
+        return True
+
+    @staticmethod
+    def progress_logger(name: str):
+        """Build an on_progress callback logging every 10 percent of a download"""
+        last_step = -1
+
+        def log_progress(progress: int):
+            nonlocal last_step
+            if progress // 10 > last_step:
+                last_step = progress // 10
+                logger.info(f"Download progress for {name}: {progress}%")
+        return log_progress
+
+
+def run_async_updates(token: str, repos_path: str) -> int:
+    """Run the headless update check, returns the process exit code"""
+    try:
+        config_path = get_config_path('config.json')
+        cache_size_mb = DEFAULT_CACHE_SIZE_MB
+        segment_threshold_mb = DEFAULT_SEGMENT_THRESHOLD_MB
+        if os.path.exists(config_path):
+            cache_size_mb = int(
+                get_setting(config_path, 'download_cache_size', DEFAULT_CACHE_SIZE_MB)
+            )
+            segment_threshold_mb = int(get_setting(
+                config_path, 'segmented_download_threshold', DEFAULT_SEGMENT_THRESHOLD_MB
+            ))
+        blob_cache = None
+        if cache_size_mb > 0:
+            blob_cache = BlobCache(get_config_path('download_cache'), cache_size_mb * 1024 * 1024)
+        engine = AsyncUpdateEngine(
+            token, repos_path, blob_cache=blob_cache,
+            segment_threshold=segment_threshold_mb * 1024 * 1024
+        )
+        return asyncio.run(engine.run())
+    except Exception as e:
+        logger.error(f"Error in headless update: {e}")
+        return 1
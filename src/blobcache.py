@@ -0,0 +1,118 @@
+import contextlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE_MB = 1024
+
+
+class BlobCache():
+    """Content-addressed store of downloaded assets shared by all repos
+
+    Blobs are stored under their SHA-256 and found by that digest or by the
+    asset URL they were downloaded from. Least recently used blobs are evicted
+    once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault('blobs', {})
+        index.setdefault('urls', {})
+        return index
+
+    def _save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256)
+
+    def lookup(self, url: str, sha256: str = None):
+        """Get the path of a cached blob for url or sha256, None on a miss"""
+        with self._lock:
+            digest = sha256 or self._index['urls'].get(url)
+            if not digest or digest not in self._index['blobs']:
+                return None
+            path = self._blob_path(digest)
+            if not os.path.exists(path):
+                self._forget(digest)
+                self._save_index()
+                return None
+            self._index['blobs'][digest]['last_used'] = time.time()
+            self._index['urls'][url] = digest
+            self._save_index()
+            logger.info(f"Download cache hit for {os.path.basename(url)}")
+            return path
+
+    def temp_file(self):
+        """Open a temporary file inside the cache to be committed with commit()"""
+        fd, tmp_path = tempfile.mkstemp(prefix='.incoming-', dir=self.blob_dir)
+        return tmp_path, os.fdopen(fd, 'wb')
+
+    def add(self, path: str, url: str, sha256: str):
+        """Store a downloaded file, hard linked when possible so no data is copied"""
+        tmp_path, file = self.temp_file()
+        file.close()
+        os.remove(tmp_path)
+        try:
+            os.link(path, tmp_path)
+        except OSError:
+            shutil.copyfile(path, tmp_path)
+        self.commit(tmp_path, url, sha256)
+
+    def commit(self, tmp_path: str, url: str, sha256: str):
+        """Move a completed temporary file into the cache under its digest"""
+        with self._lock:
+            os.replace(tmp_path, self._blob_path(sha256))
+            self._index['blobs'][sha256] = {
+                'size': os.path.getsize(self._blob_path(sha256)), 'last_used': time.time()
+            }
+            self._index['urls'][url] = sha256
+            self._evict()
+            self._save_index()
+
+    def _forget(self, sha256: str):
+        self._index['blobs'].pop(sha256, None)
+        for url in [url for url, digest in self._index['urls'].items() if digest == sha256]:
+            del self._index['urls'][url]
+
+    def _evict(self):
+        blobs = self._index['blobs']
+        total = sum(blob['size'] for blob in blobs.values())
+        for digest in sorted(blobs, key=lambda d: blobs[d]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= blobs[digest]['size']
+            logger.info(f"Evicting {digest} from the download cache")
+            with contextlib.suppress(OSError):
+                os.remove(self._blob_path(digest))
+            self._forget(digest)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(blob['size'] for blob in self._index['blobs'].values())
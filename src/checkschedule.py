@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+# Bounds of the time between two checks of one repository, in seconds
+MIN_CHECK_INTERVAL = 60 * 60
+MAX_CHECK_INTERVAL = 7 * 24 * 60 * 60
+# Checks spread over the typical time between two releases
+CHECKS_PER_RELEASE = 4
+# Random spread of the interval so repositories do not all come due together
+CHECK_JITTER = 0.1
+# Publish times kept per repository
+RELEASE_HISTORY_SIZE = 20
+# Minutes between looks for repositories that are due
+CHECK_TICK_MINUTES = 15
+
+
+def merge_release_times(known: list, new: list) -> list:
+    """Combine publish timestamps, newest last, without duplicates"""
+    times = sorted(set(known) | set(new))
+    return times[-RELEASE_HISTORY_SIZE:]
+
+
+def release_gap(release_times: list):
+    """Median seconds between consecutive releases, None with fewer than two releases"""
+    gaps = [
+        later - earlier
+        for earlier, later in zip(release_times, release_times[1:], strict=False)
+        if later > earlier
+    ]
+    if not gaps:
+        return None
+    return statistics.median(gaps)
+
+
+def next_check_interval(release_times: list, default_interval: float, now: float = None,
+                        rng=random) -> float:
+    """Seconds until a repository is checked again, learned from when it released before
+
+    Repositories releasing often are checked several times per typical gap,
+    ones that have been quiet for longer than their gap are checked less as
+    the silence grows. Without a cadence default_interval is used.
+    """
+    now = time.time() if now is None else now
+    gap = release_gap(release_times)
+    if gap is None:
+        interval = default_interval
+    else:
+        interval = gap / CHECKS_PER_RELEASE
+        quiet_for = now - release_times[-1]
+        if quiet_for > gap:
+            interval = max(interval, quiet_for / CHECKS_PER_RELEASE)
+    interval = min(max(interval, MIN_CHECK_INTERVAL), MAX_CHECK_INTERVAL)
+    return interval * rng.uniform(1 - CHECK_JITTER, 1 + CHECK_JITTER)
+
+
+def plan_next_check(schedule: dict, release, default_interval: float, now: float = None) -> dict:
+    """Get the schedule entry of a repository after a check that found release, which may be None"""
+    now = time.time() if now is None else now
+    release_times = (schedule or {}).get('release_times', [])
+    if release is not None:
+        published = list(getattr(release, 'history', []))
+        if release.published_at:
+            published.append(release.published_at)
+        release_times = merge_release_times(release_times, [dt.timestamp() for dt in published])
+    return {
+        'release_times': release_times,
+        'next_check': now + next_check_interval(release_times, default_interval, now)
+    }
+
+
+def due_repos(repos: list, schedules: dict, now: float = None) -> list:
+    """Names of the repositories whose next check time has passed or that have no schedule yet"""
+    now = time.time() if now is None else now
+    due = []
+    for repo in repos:
+        schedule = schedules.get(repo['url'])
+        if schedule is None or schedule['next_check'] <= now:
+            due.append(repo['name'])
+    return due
@@ -0,0 +1,145 @@
+import logging
+import os
+from collections import deque
+from urllib.parse import urlparse
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from src.blobcache import BlobCache
+from src.downloads import DEFAULT_SEGMENT_THRESHOLD_MB
+from src.updater import DownloadWorker
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DOWNLOADS = 3
+
+
+class DownloadJob():
+    def __init__(self, name: str, url: str, path: str, version: str, sha256: str = None,
+                 checksum_url: str = None, zsync_url: str = None):
+        self.name = name
+        self.url = url
+        self.path = path
+        self.version = version
+        self.sha256 = sha256
+        self.checksum_url = checksum_url
+        self.zsync_url = zsync_url
+        self.host = urlparse(url).netloc
+        self.path_key = os.path.normcase(os.path.realpath(path))
+        self.thread = None
+        self.worker = None
+        self.failed = False
+
+
+class DownloadQueue(QObject):
+    """Runs DownloadWorker transfers with a global and an optional per-host limit
+
+    Release assets all come from GitHub, so unless max_per_host is given the
+    global limit is the only one. Jobs installing into the same directory never
+    run at the same time, a job waits in the queue until the path it writes to
+    is released.
+    """
+    queue_changed = pyqtSignal(int, int)  # queued, active
+    progress = pyqtSignal(str, int)  # name, percentage
+    finished = pyqtSignal(str, str)  # name, version
+    error = pyqtSignal(str, str)  # name, message
+
+    def __init__(self, max_active: int = DEFAULT_MAX_DOWNLOADS, max_per_host: int = None,
+                 segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD_MB * 1024 * 1024,
+                 blob_cache: BlobCache = None):
+        super().__init__()
+        self.max_active = max_active
+        self.max_per_host = max_per_host
+        self.segment_threshold = segment_threshold
+        self.blob_cache = blob_cache
+        self._pending = deque()
+        self._active = {}
+        # Jobs whose worker is done but whose thread has not stopped yet
+        self._stopping = set()
+
+    def queued_count(self) -> int:
+        return len(self._pending)
+
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def set_max_active(self, max_active: int):
+        self.max_active = max_active
+        self._start_next()
+
+    def is_scheduled(self, name: str) -> bool:
+        return name in self._active or any(job.name == name for job in self._pending)
+
+    def enqueue(self, name: str, url: str, path: str, version: str, sha256: str = None,
+                checksum_url: str = None, zsync_url: str = None) -> bool:
+        """Queue a download, returns False if one for name is already queued or running
+
+        sha256 or a checksum_url listing the asset makes the worker verify the download,
+        a zsync_url lets it reuse the blocks of an installed AppImage.
+        """
+        if self.is_scheduled(name):
+            logger.info(f"Download for {name} already scheduled")
+            return False
+        self._pending.append(DownloadJob(name, url, path, version, sha256, checksum_url, zsync_url))
+        logger.info(f"Queued download for {name}")
+        self._start_next()
+        return True
+
+    def _can_start(self, job: DownloadJob) -> bool:
+        active_jobs = self._active.values()
+        if any(active.path_key == job.path_key for active in active_jobs):
+            return False
+        max_per_host = self.max_per_host or self.max_active
+        return sum(active.host == job.host for active in active_jobs) < max_per_host
+
+    def _start_next(self):
+        for job in list(self._pending):
+            if len(self._active) >= self.max_active:
+                break
+            if self._can_start(job):
+                self._pending.remove(job)
+                self._start(job)
+        self.queue_changed.emit(len(self._pending), len(self._active))
+
+    def _start(self, job: DownloadJob):
+        logger.info(f"Starting download for {job.name}")
+        job.thread = QThread()
+        job.worker = DownloadWorker(
+            job.url,
+            job.path,
+            self.segment_threshold,
+            expected_sha256=job.sha256,
+            checksum_url=job.checksum_url,
+            zsync_url=job.zsync_url,
+            blob_cache=self.blob_cache
+        )
+        job.worker.moveToThread(job.thread)
+        self._active[job.name] = job
+
+        job.thread.started.connect(job.worker.run)
+        job.worker.progress.connect(lambda p: self.progress.emit(job.name, p))
+        job.worker.finished.connect(lambda: self._on_finished(job))
+        job.worker.error.connect(lambda e: self._on_error(job, e))
+        job.worker.finished.connect(job.thread.quit)
+        job.worker.finished.connect(job.worker.deleteLater)
+        job.thread.finished.connect(job.thread.deleteLater)
+        job.thread.finished.connect(lambda: self._stopping.discard(job))
+
+        job.thread.start()
+
+    def _on_error(self, job: DownloadJob, message: str):
+        logger.error(f"Download error for {job.name}: {message}")
+        job.failed = True
+        self.error.emit(job.name, message)
+
+    def _on_finished(self, job: DownloadJob):
+        # DownloadWorker also finishes after an error, only successful jobs are reported
+        self._active.pop(job.name, None)
+        self._stopping.add(job)
+        if not job.failed:
+            self.finished.emit(job.name, job.version)
+        self._start_next()
@@ -0,0 +1,592 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.releases import parse_checksum_file
+from src.zsync import ZsyncControl, ZsyncDelta, find_seed_file
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TYPES = ['zip', 'tar', 'gz', 'bz2', '7z']
+# Archives that can be unpacked sequentially while they download, zip needs its central directory
+STREAMABLE_ARCHIVES = ('.tar', '.tar.gz', '.tar.bz2')
+CHUNK_SIZE = 8192
+# Assets at least this large are fetched over several connections, 0 disables it
+DEFAULT_SEGMENT_THRESHOLD_MB = 64
+DEFAULT_SEGMENTS = 4
+# Bytes a segment downloads between saves of the resume state
+SEGMENT_STATE_INTERVAL = 4 * 1024 * 1024
+
+
+def is_archive(filename: str) -> bool:
+    return filename.split('.')[-1] in ARCHIVE_TYPES
+
+
+class ChecksumError(ValueError):
+    pass
+
+
+class Sha256Verifier():
+    """Incremental SHA-256 of the chunks of a download, compared against a published digest"""
+
+    def __init__(self, expected: str = None):
+        self.expected = expected.lower() if expected else None
+        self._hash = hashlib.sha256()
+
+    def update(self, chunk: bytes):
+        self._hash.update(chunk)
+
+    def reset(self):
+        """Start over, used when data already hashed is thrown away"""
+        self._hash = hashlib.sha256()
+
+    def update_from_file(self, path: str, length: int = None):
+        """Hash the first length bytes of path, used for data already on disk"""
+        remaining = os.path.getsize(path) if length is None else length
+        with open(path, 'rb') as f:
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                self._hash.update(chunk)
+                remaining -= len(chunk)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def verify(self, name: str):
+        """Raise ChecksumError if a digest was published and does not match"""
+        if not self.expected:
+            return
+        actual = self.hexdigest()
+        if actual != self.expected:
+            raise ChecksumError(
+                f"SHA-256 mismatch for {name}: expected {self.expected}, got {actual}"
+            )
+        logger.info(f"SHA-256 verified for {name}")
+
+
+def fetch_expected_sha256(session, checksum_url: str, filename: str):
+    """Download a checksum file and get the SHA-256 listed for filename, None if unavailable"""
+    try:
+        response = session.get(checksum_url, timeout=30)
+        response.raise_for_status()
+        digest = parse_checksum_file(response.text, filename)
+    except Exception as e:
+        logger.warning(f"Could not get checksum for {filename}: {e}")
+        return None
+    if not digest:
+        logger.warning(f"{filename} is not listed in {checksum_url}")
+    return digest
+
+
+def is_streamable_archive(filename: str) -> bool:
+    return filename.lower().endswith(STREAMABLE_ARCHIVES)
+
+
+def extract_download(full_path: str, outdir: str):
+    """Extract a downloaded archive into outdir and remove it, other files are left as is"""
+    filename = os.path.basename(full_path)
+    if not is_archive(filename):
+        return
+    import patoolib
+    logger.info(f"Extracting {filename.split('.')[-1]} archive")
+    patoolib.extract_archive(full_path, outdir=outdir)
+    os.remove(full_path)
+
+
+def parse_content_range(value: str) -> tuple:
+    """Parse a 'bytes start-end/total' Content-Range header, total is None when unknown"""
+    unit, _, byte_range = (value or '').partition(' ')
+    span, _, total = byte_range.partition('/')
+    start, _, end = span.partition('-')
+    if unit != 'bytes' or not start.isdigit() or not end.isdigit():
+        raise ValueError(f"Invalid Content-Range: {value}")
+    return int(start), int(end), int(total) if total.isdigit() else None
+
+
+class PartialDownload():
+    """Download target written to <file>.part and renamed into place once complete
+
+    The validators of the response are kept in <file>.part.json so an interrupted
+    download resumes with a Range request instead of starting over.
+    """
+
+    def __init__(self, full_path: str, url: str):
+        self.full_path = full_path
+        self.url = url
+        self.part_path = full_path + '.part'
+        self.state_path = full_path + '.part.json'
+        self.state = self._load_state()
+        self.offset = 0
+        if self.state and os.path.exists(self.part_path):
+            self.offset = os.path.getsize(self.part_path)
+        else:
+            self.discard()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            # Segmented downloads use a preallocated part file that cannot be appended to
+            return state if state.get('url') == self.url and 'segments' not in state else None
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self):
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+
+    def request_headers(self) -> dict:
+        """Headers resuming the download
+
+        If-Range makes the server send the whole file again when it changed.
+        """
+        if not self.offset:
+            return {}
+        headers = {'Range': f'bytes={self.offset}-'}
+        validator = self.state.get('etag') or self.state.get('last_modified')
+        if validator:
+            headers['If-Range'] = validator
+        return headers
+
+    def begin(self, status: int, headers) -> tuple:
+        """Open the part file for a response
+
+        Returns the file, the bytes already present and the total size.
+        """
+        if self.offset and status == 206:
+            start, _, total = parse_content_range(headers.get('Content-Range'))
+            if start != self.offset:
+                raise ValueError(f"Server resumed at byte {start} instead of {self.offset}")
+            logger.info(f"Resuming download of {os.path.basename(self.full_path)} at byte {start}")
+            return open(self.part_path, 'ab'), self.offset, total or 0
+
+        if self.offset:
+            name = os.path.basename(self.full_path)
+            logger.info(f"Server ignored the range request, restarting {name}")
+        self.offset = 0
+        self.state = {
+            'url': self.url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'total_size': int(headers.get('Content-Length') or 0)
+        }
+        self._save_state()
+        return open(self.part_path, 'wb'), 0, self.state['total_size']
+
+    def finalize(self):
+        """Move the completed part file into place"""
+        os.replace(self.part_path, self.full_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def discard(self):
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.state = None
+        self.offset = 0
+
+
+def probe_range_support(session, url: str) -> tuple:
+    """Get the size and validator of url if the server accepts byte ranges, else (0, None)"""
+    try:
+        response = session.head(url, allow_redirects=True, timeout=30)
+        response.raise_for_status()
+    except Exception as e:
+        logger.info(f"Range probe failed for {url}: {e}")
+        return 0, None
+    if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+        return 0, None
+    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+    return int(response.headers.get('Content-Length') or 0), validator
+
+
+class SegmentedDownload():
+    """Download split into byte ranges fetched in parallel into a preallocated .part file
+
+    Progress of every segment is kept in <file>.part.json so an interrupted
+    download resumes each segment where it stopped.
+    """
+
+    def __init__(self, full_path: str, url: str, total_size: int, validator: str = None,
+                 segments: int = DEFAULT_SEGMENTS):
+        self.full_path = full_path
+        self.url = url
+        self.total_size = total_size
+        self.validator = validator
+        self.part_path = full_path + '.part'
+        self.state_path = full_path + '.part.json'
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+        if not self.state:
+            self.state = {
+                'url': url,
+                'validator': validator,
+                'total_size': total_size,
+                'segments': self._split(segments)
+            }
+            with open(self.part_path, 'wb') as f:
+                f.truncate(total_size)
+            self._save_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get('url') == self.url and state.get('validator') == self.validator
+                and state.get('total_size') == self.total_size and 'segments' in state
+                and os.path.exists(self.part_path)
+                and os.path.getsize(self.part_path) == self.total_size):
+            logger.info(f"Resuming segmented download of {os.path.basename(self.full_path)}")
+            return state
+        return None
+
+    def _save_state(self):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _split(self, count: int) -> list:
+        """Split the file into [start, end, done] byte ranges, end is inclusive"""
+        segment_size = -(-self.total_size // count)
+        return [
+            [start, min(start + segment_size, self.total_size) - 1, 0]
+            for start in range(0, self.total_size, segment_size)
+        ]
+
+    def downloaded(self) -> int:
+        return sum(done for _, _, done in self.state['segments'])
+
+    def run(self, session, on_progress=None, verifier=None):
+        """Fetch all missing ranges and move the completed file into place
+
+        Ranges arrive out of order, so a verifier with an expected digest hashes the
+        finished part file in one pass before it is moved.
+        """
+        segments = self.state['segments']
+        pending = [i for i, (start, end, done) in enumerate(segments) if start + done <= end]
+        logger.info(f"Downloading {os.path.basename(self.full_path)} in {len(pending)} segments")
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+            futures = [pool.submit(self._fetch_segment, session, i, on_progress) for i in pending]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                with self._lock:
+                    self._save_state()
+
+        if verifier and verifier.expected:
+            verifier.update_from_file(self.part_path)
+            try:
+                verifier.verify(os.path.basename(self.full_path))
+            except ChecksumError:
+                os.remove(self.part_path)
+                os.remove(self.state_path)
+                raise
+
+        os.replace(self.part_path, self.full_path)
+        os.remove(self.state_path)
+
+    def _fetch_segment(self, session, index: int, on_progress):
+        segment = self.state['segments'][index]
+        start, end, done = segment
+        headers = {'Range': f'bytes={start + done}-{end}'}
+        if self.validator:
+            headers['If-Range'] = self.validator
+        response = session.get(self.url, stream=True, headers=headers, timeout=30)
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise ValueError("Server did not honour the range request, the file may have changed")
+        range_start, _, _ = parse_content_range(response.headers.get('Content-Range'))
+        if range_start != start + done:
+            raise ValueError(
+                f"Server returned range starting at {range_start} instead of {start + done}"
+            )
+
+        unsaved = 0
+        with open(self.part_path, 'r+b') as f:
+            f.seek(start + done)
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                chunk = chunk[:end + 1 - (start + segment[2])]
+                f.write(chunk)
+                unsaved += len(chunk)
+                with self._lock:
+                    segment[2] += len(chunk)
+                    if unsaved >= SEGMENT_STATE_INTERVAL:
+                        # Data must be on disk before the state claims it is
+                        f.flush()
+                        self._save_state()
+                        unsaved = 0
+                    if on_progress:
+                        on_progress(self.downloaded(), self.total_size)
+
+
+class ChunkReader():
+    """Read-only file object over an iterator of byte chunks"""
+
+    def __init__(self, chunks, on_chunk=None):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self.on_chunk = on_chunk
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            if self.on_chunk:
+                self.on_chunk(chunk)
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _merge_tree(src: str, dst: str):
+    """Move the contents of src into dst, replacing existing files"""
+    for entry in os.listdir(src):
+        src_entry = os.path.join(src, entry)
+        dst_entry = os.path.join(dst, entry)
+        if os.path.isdir(src_entry) and not os.path.islink(src_entry) and os.path.isdir(dst_entry):
+            _merge_tree(src_entry, dst_entry)
+            continue
+        if os.path.isdir(dst_entry) and not os.path.islink(dst_entry):
+            shutil.rmtree(dst_entry)
+        os.replace(src_entry, dst_entry)
+
+
+def extract_tar_stream(chunks, outdir: str, on_chunk=None, verify=None):
+    """Unpack a tar stream into outdir without writing the archive to disk
+
+    Members are unpacked into a staging directory first and only moved into
+    outdir once the whole stream was read and verify, if given, did not raise.
+    """
+    staging = tempfile.mkdtemp(prefix='.extract-', dir=outdir)
+    try:
+        reader = ChunkReader(chunks, on_chunk)
+        with tarfile.open(fileobj=reader, mode='r|*') as tar:
+            tar.extractall(staging, filter='data')
+        # tarfile stops at the end-of-archive marker, consume the padding so every chunk is seen
+        while reader.read(CHUNK_SIZE):
+            pass
+        if verify:
+            verify()
+        _merge_tree(staging, outdir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+class Downloader():
+    """Download an asset into path and unpack it, without any Qt dependency
+
+    Picks the cheapest way to get the file: the download cache, a zsync delta
+    against an installed AppImage, unpacking a tar while it streams, or a
+    resumable single or segmented download. Errors are raised, progress in
+    percent is passed to on_progress.
+    """
+
+    def __init__(self, url: str, path: str,
+                 segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD_MB * 1024 * 1024,
+                 stream_extract: bool = True, expected_sha256: str = None, checksum_url: str = None,
+                 blob_cache=None, zsync_url: str = None, on_progress=None):
+        self.url = url
+        self.path = path
+        self.segment_threshold = segment_threshold
+        self.stream_extract = stream_extract
+        self.expected_sha256 = expected_sha256
+        self.checksum_url = checksum_url
+        self.blob_cache = blob_cache
+        self.zsync_url = zsync_url
+        self.on_progress = on_progress
+        self._last_progress = -1
+
+    def report_progress(self, downloaded: int, total_size: int):
+        if not total_size:
+            return
+        current_progress = int(downloaded / total_size * 100)
+        # Only report if progress changed by >= 1%
+        if current_progress > self._last_progress:
+            self._last_progress = current_progress
+            if self.on_progress:
+                self.on_progress(current_progress)
+        
+    def run(self):
+        # Create all necessary directories
+        os.makedirs(self.path, exist_ok=True)
+        
+        # Get filename from URL and create full download path
+        filename = os.path.basename(self.url)
+        full_path = os.path.join(self.path, filename)
+        
+        logger.info(f"Downloading to: {full_path}")
+        
+        # Only the threaded downloader needs requests, the headless engine uses aiohttp
+        import requests
+
+        with requests.Session() as session:
+            expected_sha256 = self.expected_sha256
+            if not expected_sha256 and self.checksum_url:
+                expected_sha256 = fetch_expected_sha256(session, self.checksum_url, filename)
+            verifier = Sha256Verifier(expected_sha256)
+            cached_path = None
+            if self.blob_cache:
+                cached_path = self.blob_cache.lookup(self.url, expected_sha256)
+
+            if self.stream_extract and is_streamable_archive(filename):
+                if cached_path:
+                    with open(cached_path, 'rb') as f:
+                        extract_tar_stream(iter(lambda: f.read(CHUNK_SIZE), b''), self.path)
+                else:
+                    self.download_and_extract(session, verifier)
+                return
+
+            if cached_path:
+                shutil.copyfile(cached_path, full_path + '.part')
+                os.replace(full_path + '.part', full_path)
+                self.report_progress(1, 1)
+            elif self.zsync_url and self.download_delta(session, full_path, verifier):
+                self.add_to_cache(full_path, verifier.hexdigest())
+            else:
+                total_size, validator = 0, None
+                if self.segment_threshold > 0:
+                    total_size, validator = probe_range_support(session, self.url)
+                if self.segment_threshold > 0 and total_size >= self.segment_threshold:
+                    download = SegmentedDownload(full_path, self.url, total_size, validator)
+                    download.run(session, self.report_progress, verifier)
+                    if self.blob_cache and not verifier.expected:
+                        # Segments are not hashed in stream without a digest to check
+                        verifier.update_from_file(full_path)
+                else:
+                    self.download_single(session, full_path, verifier)
+                self.add_to_cache(full_path, verifier.hexdigest())
+        
+        if is_archive(filename):
+            extract_download(full_path, self.path)
+
+    def add_to_cache(self, full_path: str, sha256: str):
+        if not self.blob_cache:
+            return
+        try:
+            self.blob_cache.add(full_path, self.url, sha256)
+        except Exception as e:
+            logger.warning(f"Could not add {full_path} to the download cache: {e}")
+
+    def download_delta(self, session, full_path: str, verifier: Sha256Verifier) -> bool:
+        """Build the file from the installed AppImage and its .zsync file
+
+        Returns False when a full download is needed.
+        """
+        filename = os.path.basename(full_path)
+        seed_path = find_seed_file(self.path, filename)
+        if not seed_path:
+            return False
+        try:
+            response = session.get(self.zsync_url, timeout=30)
+            response.raise_for_status()
+            delta = ZsyncDelta(ZsyncControl(response.content), self.url, seed_path, full_path)
+            if not delta.run(session):
+                logger.info(f"Too few reusable blocks for {filename}, downloading it in full")
+                return False
+        except Exception as e:
+            logger.warning(f"zsync update of {filename} failed, downloading it in full: {e}")
+            return False
+
+        verifier.update_from_file(full_path)
+        try:
+            verifier.verify(filename)
+        except ChecksumError as e:
+            logger.warning(f"{e}, downloading it in full")
+            os.remove(full_path)
+            verifier.reset()
+            return False
+        logger.info(f"Updated {filename} with zsync, fetched {delta.fetched_bytes} bytes")
+        self.report_progress(1, 1)
+        return True
+
+    def download_single(self, session, full_path: str, verifier: Sha256Verifier):
+        """Download over one connection into a .part file
+
+        Resumes where an earlier attempt stopped.
+        """
+        part = PartialDownload(full_path, self.url)
+        response = session.get(self.url, stream=True, headers=part.request_headers())
+        if response.status_code == 416:
+            # Stored part no longer matches the file on the server
+            response.close()
+            part.discard()
+            response = session.get(self.url, stream=True)
+        response.raise_for_status()
+        
+        file, downloaded, total_size = part.begin(response.status_code, response.headers)
+        if downloaded and (verifier.expected or self.blob_cache):
+            # The digest must cover the whole file, also when it only keys the cache
+            verifier.update_from_file(part.part_path, downloaded)
+        with file:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                file.write(chunk)
+                verifier.update(chunk)
+                downloaded += len(chunk)
+                self.report_progress(downloaded, total_size)
+        try:
+            verifier.verify(os.path.basename(full_path))
+        except ChecksumError:
+            part.discard()
+            raise
+        part.finalize()
+
+    def download_and_extract(self, session, verifier: Sha256Verifier):
+        """Unpack a tar archive straight from the response into the target path"""
+        filename = os.path.basename(self.url)
+        logger.info(f"Extracting {filename} while downloading")
+        response = session.get(self.url, stream=True)
+        response.raise_for_status()
+        total_size = int(response.headers.get('Content-Length') or 0)
+        downloaded = 0
+
+        # The archive is only written to disk when it is kept in the download cache
+        cache_path, cache_file = self.blob_cache.temp_file() if self.blob_cache else (None, None)
+
+        def on_chunk(chunk):
+            nonlocal downloaded
+            verifier.update(chunk)
+            if cache_file:
+                cache_file.write(chunk)
+            downloaded += len(chunk)
+            self.report_progress(downloaded, total_size)
+
+        try:
+            with response:
+                extract_tar_stream(
+                    response.iter_content(chunk_size=CHUNK_SIZE),
+                    self.path,
+                    on_chunk,
+                    verify=lambda: verifier.verify(filename)
+                )
+            if cache_file:
+                cache_file.close()
+                try:
+                    self.blob_cache.commit(cache_path, self.url, verifier.hexdigest())
+                except Exception as e:
+                    logger.warning(f"Could not add {filename} to the download cache: {e}")
+                    os.remove(cache_path)
+        finally:
+            if cache_file and not cache_file.closed:
+                cache_file.close()
+                os.remove(cache_path)
@@ -1,25 +1,46 @@
-import sys
-import dotenv
+import hashlib
+import json
+import logging
+import os
 import platform
 import re
-from github import Github, Auth
-from PyQt6 import QtWidgets
-from PyQt6.QtCore import QObject, pyqtSignal, QEventLoop
 import time
-from functools import lru_cache
-import logging
-import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QEventLoop, QObject, pyqtSignal
+
+from src.cache import TTLCache
+from src.httpcache import HttpCache
+from src.ratelimit import RateLimitBudget
+from src.releasefeed import FEED_BASE_URL, ReleaseFeed
+from src.releases import (
+    API_URL,
+    GRAPHQL_BATCH_SIZE,
+    GRAPHQL_URL,
+    Release,
+    build_release_query,
+    filter_platform_assets,
+    get_release_version,
+    match_package_name,
+    parse_rate_limit,
+    parse_release_batch,
+    repo_full_name,
+)
+from src.utils import get_config_dir, load_github_token
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w')
 logger = logging.getLogger(__name__)
 
-def timed_cache(seconds: int):
-    def wrapper_decorator(func):
-        func = lru_cache(maxsize=128)(func)
-        func.lifetime = seconds
-        func.expiration = time.time() + seconds
-        return func
-    return wrapper_decorator
+# Seconds a fetched release is reused before it is looked up again
+RELEASE_CACHE_TTL = 300
+RELEASE_CACHE_SIZE = 512
+HTTP_POOL_SIZE = 32
+# Identity and rate limit of the last successful token validation
+SESSION_FILE = 'session.json'
+# Release feeds read at the same time before a batched release lookup
+FEED_WORKERS = 8
 
 
 def clean_github_link(link: str) -> str:
@@ -38,14 +59,6 @@ def arch_variants(arch: str) -> list:
     else:
         return [arch]        
 
-def resource_path(relative_path):
-    """Get absolute path to resource"""
-    if hasattr(sys, '_MEIPASS'):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
 class AssetSelector(QObject):
     selection_needed = pyqtSignal(list, str)
     selection_complete = pyqtSignal(str)
@@ -70,22 +83,51 @@ class AssetSelector(QObject):
         if self._selection_event and self._selection_event.isRunning():
             self._selection_event.quit()
 
+class TokenValidator(QObject):
+    """Validates the GitHub token off the GUI thread"""
+    validated = pyqtSignal(dict)  # identity
+    failed = pyqtSignal(str, bool)  # message, whether the token was rejected
+    finished = pyqtSignal()
+
+    def __init__(self, git):
+        super().__init__()
+        self.git = git
+
+    def run(self):
+        try:
+            self.validated.emit(self.git.validate_token())
+        except requests.HTTPError as e:
+            rejected = e.response is not None and e.response.status_code == 401
+            logger.error(f"Token validation failed: {e}")
+            self.failed.emit(str(e), rejected)
+        except Exception as e:
+            logger.warning(f"Could not reach GitHub to validate the token: {e}")
+            self.failed.emit(str(e), False)
+        self.finished.emit()
+
 class GitHub():
     def __init__(self):
-        # Load env from executable directory or current directory
-        env_path = resource_path('.env')
         try:
-            if not dotenv.load_dotenv(env_path):
-                raise FileNotFoundError(".env file not found")
-                
-            token = os.getenv("GITHUB_ACCESS_TOKEN")
-            if not token:
-                raise ValueError("GitHub access token not found in .env")
-                
-            self.auth = Auth.Token(token)
-            self.g = Github(auth=self.auth)
-            # Test connection
-            self.g.get_user().login
+            token = load_github_token()
+            self.token = token
+            self.session = requests.Session()
+            self.session.headers.update({'Authorization': f'bearer {token}'})
+            # Sized for the concurrent update check workers sharing this session
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE)
+            self.session.mount('https://', adapter)
+            # Every API response updates the remaining request budget
+            self.rate_limit = RateLimitBudget()
+            self.session.hooks['response'].append(self._track_rate_limit)
+            self.http_cache = HttpCache(os.path.join(get_config_dir(), 'http_cache'), self.session)
+            self.release_cache = TTLCache(maxsize=RELEASE_CACHE_SIZE, ttl=RELEASE_CACHE_TTL)
+            # Set with enable_release_feed, consulted before release lookups when enabled
+            self.release_feed = None
+            # The token is validated in the background by TokenValidator, until then
+            # the identity stored by the last session is used
+            self.session_path = os.path.join(get_config_dir(), SESSION_FILE)
+            self.identity = self.load_identity()
+            if self.identity and self.identity.get('rate_limit'):
+                self.rate_limit.set_snapshot('core', self.identity['rate_limit'])
             
             self.current_os = platform.system().lower()
             logger.info(f"OS: {self.current_os}")
@@ -98,31 +140,179 @@ class GitHub():
             logger.error(f"GitHub initialization failed: {e}")
             raise
     
-    @timed_cache(300)
+    def _token_id(self) -> str:
+        # Stored instead of the token so a cached identity is never shown for another token
+        return hashlib.sha256(self.token.encode()).hexdigest()[:16]
+
+    def load_identity(self) -> dict:
+        """Get the identity stored by the last validation of this token, empty if there is none"""
+        try:
+            with open(self.session_path, 'r', encoding='utf-8') as f:
+                identity = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return identity if identity.get('token_id') == self._token_id() else {}
+
+    def _track_rate_limit(self, response, *args, **kwargs):
+        if response.url.startswith(API_URL):
+            self.rate_limit.update(response.headers)
+
+    def validate_token(self) -> dict:
+        """Check the token against the API and store the identity and rate limit for the next start
+
+        Raises requests.HTTPError when the token is rejected and other requests
+        exceptions when GitHub cannot be reached.
+        """
+        response = self.session.get(f'{API_URL}/user', timeout=30)
+        response.raise_for_status()
+        identity = {
+            'token_id': self._token_id(),
+            'login': response.json().get('login'),
+            'validated_at': time.time(),
+            'rate_limit': parse_rate_limit(response.headers)
+        }
+        self.identity = identity
+        tmp_path = self.session_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(identity, f, indent=4)
+        os.replace(tmp_path, self.session_path)
+        logger.info(f"Authenticated as {identity['login']}")
+        return identity
+
+    def enable_release_feed(self, enabled: bool = True, base_url: str = FEED_BASE_URL):
+        """Check the releases.atom feed of a repository before asking the API
+
+        The API is only asked for the latest release when the feed changed.
+        """
+        if not enabled:
+            self.release_feed = None
+            return
+        # The public feeds are read without the API token
+        feed_session = requests.Session()
+        feed_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=FEED_WORKERS))
+        feed_cache = HttpCache(os.path.join(get_config_dir(), 'http_cache'), feed_session)
+        self.release_feed = ReleaseFeed(feed_cache, base_url)
+
     def get_latest_release_url(self, repo_url):
+        latest_release = self.release_cache.get(('release', repo_url))
+        if latest_release:
+            return latest_release
+        feed_entry = None
+        if self.release_feed:
+            feed_entry, latest_release = self.release_feed.check(repo_url)
+            if latest_release:
+                self.release_cache.set(('release', repo_url), latest_release)
+                return latest_release
         logger.info(f"Getting latest release URL for {repo_url}")
-        repo_name = repo_url.split('/')[3] + '/' + repo_url.split('/')[4]
-        repo = self.g.get_repo(repo_name)
-        if not repo:
-            logger.error(f"Repository not found for {repo_name}")
-            return None
-        latest_release = repo.get_latest_release()
-        if not latest_release:
-            logger.error(f"Latest release not found for {repo_name}")
-            return None
+        repo_name = repo_full_name(repo_url)
+        try:
+            data = self.http_cache.get_json(f'{API_URL}/repos/{repo_name}/releases/latest')
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.error(f"Latest release not found for {repo_name}")
+                return None
+            raise
+        latest_release = Release.from_rest(data)
+        self.release_cache.set(('release', repo_url), latest_release)
+        if self.release_feed:
+            self.release_feed.remember(repo_url, feed_entry, latest_release)
+            self.release_feed.flush()
         return latest_release
+
+    def get_assets(self, repo_url, latest_release=None) -> list:
+        """Get the asset list of the latest release of a repository"""
+        assets = self.release_cache.get(('assets', repo_url))
+        if assets is None:
+            latest_release = latest_release or self.get_latest_release_url(repo_url)
+            assets = latest_release.get_assets() if latest_release else []
+            self.release_cache.set(('assets', repo_url), assets)
+        return assets
+
+    def invalidate_repo(self, repo_url):
+        """Drop cached release data of a repository so the next lookup refetches it"""
+        self.release_cache.invalidate_where(lambda key: key[1] == repo_url)
+        if self.release_feed:
+            self.release_feed.forget(repo_url)
+            self.release_feed.flush()
+
+    def cache_stats(self) -> dict:
+        return {'releases': self.release_cache.stats(), 'http': self.http_cache.stats()}
+
+    def get_latest_releases(self, repo_urls: list) -> dict:
+        """Get the latest release of many repositories with batched GraphQL queries
+
+        Returns a dict mapping repo URL to its latest release, or None when the repository
+        has no releases. Repositories missing from the result could not be resolved and
+        should be looked up with get_latest_release_url instead.
+        """
+        releases = {}
+        urls_by_name = {}
+        feed_entries = {}
+        uncached_urls = []
+        for repo_url in repo_urls:
+            cached_release = self.release_cache.get(('release', repo_url))
+            if cached_release:
+                releases[repo_url] = cached_release
+            else:
+                uncached_urls.append(repo_url)
+
+        if self.release_feed and uncached_urls:
+            # Repositories whose feed did not change keep the release fetched last time
+            with ThreadPoolExecutor(max_workers=FEED_WORKERS) as pool:
+                checks = list(pool.map(self.release_feed.check, uncached_urls))
+            unchanged = 0
+            for repo_url, (feed_entry, known_release) in zip(uncached_urls, checks, strict=True):
+                if known_release:
+                    releases[repo_url] = known_release
+                    self.release_cache.set(('release', repo_url), known_release)
+                    unchanged += 1
+                else:
+                    feed_entries[repo_url] = feed_entry
+            uncached_urls = list(feed_entries)
+            logger.info(f"Release feeds unchanged for {unchanged} repositories")
+
+        for repo_url in uncached_urls:
+            try:
+                urls_by_name.setdefault(repo_full_name(repo_url), []).append(repo_url)
+            except IndexError:
+                logger.error(f"Invalid repository URL: {repo_url}")
+        repo_names = list(urls_by_name)
+
+        for start in range(0, len(repo_names), GRAPHQL_BATCH_SIZE):
+            batch = repo_names[start:start + GRAPHQL_BATCH_SIZE]
+            if not self.rate_limit.acquire('graphql'):
+                logger.warning("GraphQL rate limit budget used up, skipping the remaining batches")
+                break
+            logger.info(f"Getting latest releases for {len(batch)} repositories via GraphQL")
+            try:
+                query, variables = build_release_query(batch)
+                payload = {'query': query, 'variables': variables}
+                response = self.session.post(GRAPHQL_URL, json=payload, timeout=30)
+                response.raise_for_status()
+                result = response.json()
+            except Exception as e:
+                logger.error(f"GraphQL release query failed: {e}")
+                continue
+
+            for error in result.get('errors') or []:
+                logger.warning(f"GraphQL error: {error.get('message')}")
+
+            for repo_name, release in parse_release_batch(result, batch).items():
+                for repo_url in urls_by_name[repo_name]:
+                    releases[repo_url] = release
+                    if release:
+                        self.release_cache.set(('release', repo_url), release)
+                        if self.release_feed:
+                            self.release_feed.remember(
+                                repo_url, feed_entries.get(repo_url), release
+                            )
+        if self.release_feed:
+            self.release_feed.flush()
+        return releases
     
     def get_asset_version(self, asset, page):
         logger.info(f"Getting asset version for {asset.name}")
-        # Try to extract version number from the release title
-        version_pattern = re.compile(r'\d+(\.\d+)+')
-        match = version_pattern.search(page.title)
-        
-        if match:
-            return match.group(0)
-        else:
-            # If no version number is found, use the upload date
-            return asset.updated_at.astimezone().strftime("%Y-%m-%d")
+        return get_release_version(asset, page)
         
     def find_correct_asset_in_list(self, latest_release, parent: QtWidgets.QWidget = None, correct_package_name: str = None):
         try:
@@ -136,17 +326,9 @@ class GitHub():
             logger.info(f"Finding correct asset in list for {latest_release.html_url}")
             arch_variants_list = arch_variants(self.current_arch)       
             
-            os_filtered_assets = []
-            for asset in latest_release.get_assets():
-                asset_name = asset.name.lower()
-                if self.current_os in asset_name:
-                    os_filtered_assets.append(asset)
-                elif self.current_os == 'linux' and asset_name.endswith('.appimage'):
-                    os_filtered_assets.append(asset)
-                elif self.current_os == 'windows' and asset_name.endswith('.exe'):
-                    os_filtered_assets.append(asset)
-                elif self.current_os == 'darwin' and asset_name.endswith('.dmg'):
-                    os_filtered_assets.append(asset)
+            os_filtered_assets = filter_platform_assets(
+                latest_release.get_assets(), self.current_os
+            )
 
             if not os_filtered_assets:
                 QtWidgets.QMessageBox.warning(parent, "Info", "No assets found for the current OS and architecture.")
@@ -154,11 +336,9 @@ class GitHub():
                 return None, None
             
             if correct_package_name:
-                # Filter assets by package name pattern
-                correct_package_name_pattern = re.escape(correct_package_name).replace(r'\*', r'\d+(\.\d+)*')
-                for asset in os_filtered_assets:
-                    if re.match(correct_package_name_pattern, asset.name):
-                        return asset, None
+                asset = match_package_name(os_filtered_assets, correct_package_name)
+                if asset:
+                    return asset, None
 
             if len(os_filtered_assets) == 1:
                 return os_filtered_assets[0], None
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+
+class HttpCache():
+    """On-disk cache of JSON API responses revalidated with ETag/Last-Modified
+
+    Cached responses are revalidated with If-None-Match/If-Modified-Since, a 304
+    reply is served from disk and does not count against the GitHub rate limit.
+    get_parsed sends the requests through session, revalidate, not_modified and
+    update let a client of its own, like the asyncio engine, share the cache.
+    """
+
+    def __init__(self, cache_dir: str, session):
+        self.cache_dir = cache_dir
+        self.session = session
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidations': 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def load(self, url: str):
+        """Get the cached entry for url or None"""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get('url') == url else None
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, headers, body):
+        """Store a response body if the server sent a validator for it"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'body': body}
+        path = self._entry_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing HTTP cache entry for {url}: {e}")
+
+    def conditional_headers(self, entry) -> dict:
+        """Get the revalidation headers for a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidate(self, url: str, headers: dict = None) -> tuple:
+        """Get the cached entry of url and the request headers revalidating it"""
+        entry = self.load(url)
+        conditional_headers = self.conditional_headers(entry)
+        if conditional_headers:
+            self.record('revalidations')
+        return entry, {**(headers or {}), **conditional_headers}
+
+    def not_modified(self, entry, status: int) -> bool:
+        """Whether a response with status lets the cached entry be served"""
+        if status == 304 and entry:
+            self.record('hits')
+            logger.debug(f"HTTP cache hit for {entry['url']}")
+            return True
+        return False
+
+    def update(self, url: str, headers, body):
+        """Count a miss and store the new body of url"""
+        self.record('misses')
+        self.store(url, headers, body)
+
+    def record(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> dict:
+        """Get hit, miss and revalidation counters"""
+        with self._lock:
+            return dict(self._stats)
+
+    def get_json(self, url: str, timeout: int = 30):
+        """GET url and return the decoded JSON body, served from disk on 304"""
+        return self.get_parsed(url, lambda response: response.json(), timeout)
+
+    def get_parsed(self, url: str, parse, timeout: int = 30, headers: dict = None):
+        """GET url and return parse(response), served from disk on 304
+
+        Only what parse returns is cached, it must be JSON serializable.
+        """
+        entry, request_headers = self.revalidate(url, headers)
+        response = self.session.get(url, headers=request_headers, timeout=timeout)
+        if self.not_modified(entry, response.status_code):
+            return entry['body']
+
+        response.raise_for_status()
+        body = parse(response)
+        self.update(url, response.headers, body)
+        return body
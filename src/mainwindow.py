@@ -0,0 +1,773 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+# noinspection PyUnresolvedReferences
+from assets import resources_rc  # noqa: F401
+from components.addrepoframe import AddRepoDialog
+from components.repolist import RepoItemDelegate, RepoListModel
+from components.trayicon import SystemTrayIcon
+from components.updateslist import UpdatesDelegate, UpdatesModel, UpdatesProxyModel
+from src.blobcache import DEFAULT_CACHE_SIZE_MB, BlobCache
+from src.checkschedule import CHECK_TICK_MINUTES, MIN_CHECK_INTERVAL, due_repos, plan_next_check
+from src.downloadqueue import DEFAULT_MAX_DOWNLOADS, DownloadQueue
+from src.downloads import DEFAULT_SEGMENT_THRESHOLD_MB
+from src.githubAuth import GitHub, TokenValidator, clean_github_link
+from src.ratelimit import is_rate_limit_error, prioritize_repos
+from src.releases import find_expected_sha256
+from src.settingsindex import SettingsIndex
+from src.utils import get_config_path, get_setting, get_setting_repo, open_repo_store, resource_path
+from src.zsync import find_zsync_asset
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    from components.ui_mainwindow import Ui_MainWindow
+except ImportError:
+    class Ui_MainWindow():
+        """Development fallback that parses mainwindow.ui when ui_mainwindow.py was not generated"""
+
+        def setupUi(self, window):
+            from PyQt6 import uic
+            ui_file = resource_path('components/mainwindow.ui')
+            if not os.path.exists(ui_file):
+                raise FileNotFoundError(f"UI file not found: {ui_file}")
+            logger.warning(
+                "components/ui_mainwindow.py not found, loading mainwindow.ui at runtime"
+            )
+            uic.loadUi(ui_file, window)
+
+# Concurrent release lookups when the check_workers setting is missing
+DEFAULT_CHECK_WORKERS = 8
+# Seconds after a rate limit reset before deferred checks run
+RATE_LIMIT_RESUME_MARGIN = 30
+
+
+class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
+    # Settings subscribers may run on any thread, this hands changes to the GUI thread
+    setting_changed = QtCore.pyqtSignal(str, object)
+    # Emitted by the scheduler thread, the check itself starts on the GUI thread
+    due_check_requested = QtCore.pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        logging.info("Starting GitUpdater")
+        
+        # Widgets from the compiled components/ui_mainwindow.py, regenerate it with
+        # pyuic6 components/mainwindow.ui -o components/ui_mainwindow.py
+        self.setupUi(self)
+        
+        self.setWindowTitle("GitUpdater")
+        
+        self.config_path = get_config_path('config.json')
+        self.repos_path = get_config_path('repos.json')
+
+        if not os.path.exists(self.config_path):
+            logging.info("Creating config.json")
+            with open(resource_path('src/config_template.json'), 'r') as template:
+                with open(self.config_path, 'w') as f:
+                    f.write(template.read())
+        self.repo_store = open_repo_store(self.repos_path)
+                
+        self.git = GitHub()
+        self.git.selector.selection_needed.connect(self.show_package_selection_dialog)
+        self.git.enable_release_feed(bool(get_setting(self.config_path, 'release_feeds', False)))
+            
+
+        self.repo_model = RepoListModel(self)
+        self.repoListView.setModel(self.repo_model)
+        self.repoListView.setItemDelegate(RepoItemDelegate(self.repoListView))
+        self.repoListView.clicked.connect(self.open_repo_page)
+        self.repoListView.customContextMenuRequested.connect(self.context_menu)
+
+        # Pending updates, sorted through the proxy by clicking a column header
+        self.updates_model = UpdatesModel(self)
+        self.updates_proxy = UpdatesProxyModel(self)
+        self.updates_proxy.setSourceModel(self.updates_model)
+        self.updatesView.setModel(self.updates_proxy)
+        self.updates_delegate = UpdatesDelegate(self.updatesView)
+        self.updates_delegate.update_requested.connect(self.update_repo_from_data)
+        self.updatesView.setItemDelegate(self.updates_delegate)
+        header = self.updatesView.horizontalHeader()
+        header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(UpdatesModel.NAME, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.updatesView.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.updatesView.verticalHeader().setDefaultSectionSize(UpdatesDelegate.ROW_HEIGHT)
+        self.updatesView.sortByColumn(UpdatesModel.NAME, QtCore.Qt.SortOrder.AscendingOrder)
+        self.checked_updates = set()
+        self.check_scope = set()
+        # Checks requested while one was running, started together once it is done
+        self.queued_check_all = False
+        self.queued_checks = set()
+        # Repositories skipped to stay within the rate limit, checked once it resets
+        self.deferred_checks = set()
+        self.resume_checks_timer = QtCore.QTimer(self)
+        self.resume_checks_timer.setSingleShot(True)
+        self.resume_checks_timer.timeout.connect(self.resume_deferred_checks)
+        
+        self.refreshButton.clicked.connect(lambda: self.check_for_updates())
+
+        self.addRepoButton.clicked.connect(self.open_add_repo_dialog)
+
+        self.settingsButton.clicked.connect(self.open_settings)
+
+        self.settingswindow = None
+        self.assets = {}
+        
+        logging.info("Starting Tray Icon")
+        self.tray_icon = SystemTrayIcon(self)
+        self.tray_icon.show()
+
+        # Start from the identity cached by the last session, validation happens in the background
+        self.identity_label = QtWidgets.QLabel()
+        self.statusBar().addPermanentWidget(self.identity_label)
+        self.show_identity(self.git.identity, cached=True)
+        self.validate_token()
+
+        segment_threshold_mb = int(get_setting(
+            self.config_path, 'segmented_download_threshold', DEFAULT_SEGMENT_THRESHOLD_MB
+        ))
+        cache_size_mb = int(
+            get_setting(self.config_path, 'download_cache_size', DEFAULT_CACHE_SIZE_MB)
+        )
+        blob_cache = None
+        if cache_size_mb > 0:
+            blob_cache = BlobCache(get_config_path('download_cache'), cache_size_mb * 1024 * 1024)
+        self.download_queue = DownloadQueue(
+            int(get_setting(self.config_path, 'max_downloads', DEFAULT_MAX_DOWNLOADS)),
+            segment_threshold=segment_threshold_mb * 1024 * 1024,
+            blob_cache=blob_cache
+        )
+        self.download_queue.progress.connect(
+            lambda name, p: logger.info(f"Download progress for {name}: {p}%")
+        )
+        self.download_queue.finished.connect(self.on_download_finished)
+        self.download_queue.error.connect(
+            lambda name, e: QtWidgets.QMessageBox.warning(
+                self, "Error", f"Download error for {name}: {e}"
+            )
+        )
+        self.download_queue.queue_changed.connect(self.on_download_queue_changed)
+        
+        try:
+            self.update_repo_list()
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error loading repositories: {e}")
+            logging.error(f"Error loading repositories: {e}")
+        
+        self.scheduler = None
+        self.check_running = False
+        self.default_check_interval = 0
+        self.due_check_requested.connect(self.check_due_repos)
+        self.schedule_update_checks(int(get_setting(self.config_path, 'check_updates')))
+        self.setting_changed.connect(self.on_setting_changed)
+        settings = SettingsIndex.open(self.config_path)
+        settings.subscribe('check_updates', self.setting_changed.emit)
+        settings.subscribe('max_downloads', self.setting_changed.emit)
+        settings.subscribe('release_feeds', self.setting_changed.emit)
+        self.check_for_updates()
+                
+        if get_setting(self.config_path, 'start_minimized'):
+            self.hide()
+        else: 
+            self.show()
+        self.shownbefore = False
+
+    def validate_token(self):
+        self.token_thread = QtCore.QThread()
+        self.token_validator = TokenValidator(self.git)
+        self.token_validator.moveToThread(self.token_thread)
+
+        self.token_thread.started.connect(self.token_validator.run)
+        self.token_validator.validated.connect(
+            lambda identity: self.show_identity(identity, cached=False)
+        )
+        self.token_validator.failed.connect(self.on_token_validation_failed)
+        self.token_validator.finished.connect(self.token_thread.quit)
+        self.token_validator.finished.connect(self.token_validator.deleteLater)
+        self.token_thread.finished.connect(self.token_thread.deleteLater)
+
+        self.token_thread.start()
+
+    def show_identity(self, identity, cached):
+        if not identity:
+            self.identity_label.setText("GitHub: not verified yet")
+            return
+        text = f"GitHub: {identity['login']}"
+        rate_limit = identity.get('rate_limit')
+        if rate_limit:
+            text += f", {rate_limit['remaining']}/{rate_limit['limit']} requests left"
+        if cached:
+            text += " (last session)"
+        self.identity_label.setText(text)
+
+    def on_token_validation_failed(self, message, rejected):
+        if rejected:
+            self.identity_label.setText("GitHub: token rejected")
+            QtWidgets.QMessageBox.warning(
+                self, "Error", f"The GitHub token was rejected: {message}"
+            )
+        else:
+            text = self.identity_label.text().replace(" (last session)", "")
+            self.identity_label.setText(text + " (offline)")
+
+    def schedule_update_checks(self, interval):
+        """Replace the periodic update check job, an interval of 0 hours disables it
+
+        The job looks for due repositories every few minutes. Each repository's next
+        check follows its own release cadence, interval is used for repositories
+        without one.
+        """
+        self.default_check_interval = interval * 60 * 60
+        if self.scheduler and self.scheduler.get_job('check_updates'):
+            self.scheduler.remove_job('check_updates')
+        if interval > 0:
+            if self.scheduler is None:
+                # APScheduler is slow to import and not needed while checks are disabled
+                from apscheduler.schedulers.qt import QtScheduler
+                self.scheduler = QtScheduler()
+                self.scheduler.start()
+            self.scheduler.add_job(
+                self.due_check_requested.emit, 'interval', minutes=CHECK_TICK_MINUTES,
+                id='check_updates'
+            )
+            logger.info(
+                f"Checking for updates by release cadence, "
+                f"every {interval} hours for repositories without one"
+            )
+
+    def check_due_repos(self):
+        if self.check_running:
+            return
+        due = due_repos(self.repo_store.repos(), self.repo_store.schedules())
+        if due:
+            logger.info(f"{len(due)} repositories due for an update check")
+            self.check_for_updates(due)
+
+    def on_setting_changed(self, name, value):
+        if name == 'check_updates':
+            self.schedule_update_checks(int(value))
+        elif name == 'max_downloads':
+            self.download_queue.set_max_active(int(value))
+        elif name == 'release_feeds':
+            self.git.enable_release_feed(bool(value))
+
+    def show_package_selection_dialog(self, asset_names, title):
+        try:
+            selected_name, ok = QtWidgets.QInputDialog.getItem(
+                self,
+                title,
+                "Multiple packages found. Please select the correct one:",
+                asset_names,
+                0,
+                False
+            )
+            if ok and selected_name:
+                # Directly call handle_selection to avoid signal issues
+                self.git.selector._handle_selection(selected_name)
+                
+        except Exception as e:
+            logging.error(f"Error in package selection dialog: {e}")
+            
+    def handle_package_selection(self, selected_name: str) -> None:
+        """Handle package selection from dialog
+        
+        Args:
+            selected_name: Name of selected asset package
+        """
+        try:
+            # Store selection in GitHub instance
+            self.git.selector.selected_package = selected_name
+            
+            # Signal selection is complete
+            self.git.selector.selection_complete.emit(selected_name)
+            
+            logging.debug(f"Package selected: {selected_name}")
+            
+        except Exception as e:
+            logging.error(f"Error handling package selection: {e}")
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error handling package selection: {e}")
+
+    def open_settings(self):
+        from src.settings import SettingsWindow
+
+        if not isinstance(self.settingswindow, SettingsWindow):
+            self.settingswindow = SettingsWindow(self.assets)
+        self.settingswindow.load_settings()
+        self.settingswindow.show()
+
+    def open_add_repo_dialog(self):
+        dialog = AddRepoDialog(self)
+        if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
+            dialog_data = dialog.get_data()
+            github_link = clean_github_link(dialog_data['url'])
+            try:
+                if not github_link.startswith("https://github.com/"):
+                    raise ValueError("Invalid GitHub link")
+
+                parts = github_link.split('/')                    
+
+                name = parts[3] + '/' + parts[4]
+
+                self.repo_store.add({
+                    "name": name, "url": github_link, "path": dialog_data['path'],
+                    "correct_package_name": "", "version": "",
+                    "auto_update": dialog_data['auto_update']
+                })
+                self.update_repo_list()
+                self.check_for_updates()
+
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, "Error", str(e))
+                self.open_add_repo_dialog()
+
+            QtWidgets.QMessageBox.information(
+                self, "Repository Added", "The repository has been added."
+            )
+        else:
+            dialog.deleteLater()
+            
+    def closeEvent(self, event):
+        if get_setting(self.config_path, 'minimize_to_tray'):
+            self.minimizeEvent(event)
+        else:
+            result = QtWidgets.QMessageBox.question(
+                self,
+                "Confirm Exit", 
+                "Are you sure you want to exit?",
+                QtWidgets.QMessageBox.StandardButton.Yes | 
+                QtWidgets.QMessageBox.StandardButton.No,
+                QtWidgets.QMessageBox.StandardButton.No
+            )
+            
+            if result == QtWidgets.QMessageBox.StandardButton.Yes:
+                QtWidgets.QApplication.quit()
+            else:
+                event.ignore()
+            
+    def minimizeEvent(self, event):
+        if self.tray_icon.isVisible():
+            if self.isVisible() and not self.shownbefore:
+                QtWidgets.QMessageBox.information(
+                    self, 
+                    "GitUpdater",
+                    "The application will keep running in the system tray. "
+                    "To restore, click the tray icon."
+                )
+                self.shownbefore = True
+            self.hide()
+            event.ignore()
+        else:
+            event.accept()
+
+        
+
+        
+    class UpdateWorker(QtCore.QObject):
+        # Signals
+        update_found = QtCore.pyqtSignal(dict)  # Emits update data when found
+        finished = QtCore.pyqtSignal()  # Emits when all updates checked
+        error = QtCore.pyqtSignal(str)  # Emits error messages
+        # Repo names left for after the rate limit reset, reset time
+        deferred = QtCore.pyqtSignal(list, float)
+
+        def __init__(self, git, repo_store, assets, max_workers=DEFAULT_CHECK_WORKERS,
+                     repo_names=None, default_interval=0):
+            super().__init__()
+            self.git = git
+            self.repo_store = repo_store
+            self.assets = assets
+            self.max_workers = max_workers
+            self.repo_names = repo_names
+            self.default_interval = default_interval
+            self.schedules = {}
+
+        def run(self):
+            deferred = []
+            try:
+                repos = self.repo_store.repos()
+                if self.repo_names is not None:
+                    repos = [repo for repo in repos if repo['name'] in self.repo_names]
+                # Highest priority first, so they get the API budget if it runs out
+                repos = prioritize_repos(repos, self.repo_store.last_checked())
+                self.schedules = self.repo_store.schedules()
+                releases = self.git.get_latest_releases([repo['url'] for repo in repos])
+
+                # Repos the batch lookup could not resolve are fetched concurrently, asset
+                # selection stays on this thread so package dialogs are shown one at a time
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = {}
+                    for repo in repos:
+                        if repo['url'] in releases:
+                            continue
+                        if self.git.rate_limit.acquire('core'):
+                            future = pool.submit(self.git.get_latest_release_url, repo['url'])
+                            futures[future] = repo
+                        else:
+                            deferred.append(repo['name'])
+                            self.check_stored_release(repo, "the rate limit budget is used up")
+                    for repo in repos:
+                        if repo['url'] in releases:
+                            self.check_repo(repo, releases[repo['url']])
+                    for future in as_completed(futures):
+                        repo = futures[future]
+                        try:
+                            latest_release = future.result()
+                        except Exception as e:
+                            if is_rate_limit_error(e):
+                                deferred.append(repo['name'])
+                                self.check_stored_release(repo, "the rate limit was reached")
+                                continue
+                            if not self.check_stored_release(repo, f"the lookup failed: {e}"):
+                                self.error.emit(f"Error updating {repo['name']}: {str(e)}")
+                                logging.error(f"Error updating {repo['name']}: {e}")
+                            self.postpone(repo)
+                            continue
+                        self.check_repo(repo, latest_release)
+
+            except Exception as e:
+                self.error.emit(f"Error updating updates: {str(e)}")
+                logging.error(f"Error updating updates: {e}")
+
+            if deferred:
+                resume_at = self.git.rate_limit.resume_at('core')
+                logging.warning(
+                    f"Rate limit budget used up, deferring {len(deferred)} repositories "
+                    f"until {datetime.fromtimestamp(resume_at)}"
+                )
+                self.deferred.emit(deferred, resume_at)
+                
+            logging.info(f"Cache stats: {self.git.cache_stats()}")
+            self.finished.emit()
+
+        def check_stored_release(self, repo, reason: str) -> bool:
+            """Check repo against the release stored by an earlier lookup, False if there is none
+
+            Used while offline or rate limited, so known updates are still offered.
+            """
+            latest_release = self.repo_store.get_release(repo['url'])
+            if latest_release is None:
+                return False
+            logging.warning(f"Using the stored release of {repo['name']}, {reason}")
+            self.check_repo(repo, latest_release, stored=True)
+            return True
+
+        def check_repo(self, repo, latest_release, stored=False) -> bool:
+            """Emit update_found if a newer release exists, returns whether repo was modified"""
+            try:
+                # Releases are keyed by URL, the store has the repository as it is now
+                current = self.repo_store.get_by_url(repo['url'])
+                if current is None:
+                    logging.info(f"{repo['name']} was removed or moved during the check")
+                    return False
+                repo = current
+                schedule = plan_next_check(
+                    self.schedules.get(repo['url']), latest_release, self.default_interval
+                )
+                self.repo_store.save_schedule(repo['url'], schedule)
+                if not latest_release:
+                    logging.info(f"No release found for {repo['name']}")
+                    self.repo_store.record_check(repo['name'], repo['version'])
+                    return False
+                if not stored:
+                    self.repo_store.save_release(repo['url'], latest_release)
+                self.assets[repo['name']] = self.git.get_assets(repo['url'], latest_release)
+                
+                asset, correct_package_name = self.git.find_correct_asset_in_list(
+                    latest_release,
+                    self,
+                    repo.get('correct_package_name')
+                )
+                
+                if asset:
+                    version = self.git.get_asset_version(asset=asset, page=latest_release)
+                    old_version = repo['version']
+                    self.repo_store.record_check(repo['name'], old_version, version)
+                    
+                    if old_version == version:
+                        return False
+                        
+                    if old_version == "":
+                        old_version = "N/A"
+                    
+                    sha256, checksum_url = find_expected_sha256(asset, latest_release.get_assets())
+                    zsync_asset = find_zsync_asset(asset, latest_release.get_assets())
+                    update_data = {
+                        "name": repo['name'],
+                        "old_version": old_version,
+                        "new_version": version,
+                        "updated_at": asset.updated_at.astimezone().strftime("%Y-%m-%d %H:%M:%S"),
+                        "size": asset.size,
+                        "asset_url": asset.browser_download_url,
+                        "path": repo['path'],
+                        "correct_package_name": correct_package_name,
+                        "sha256": sha256,
+                        "checksum_url": checksum_url,
+                        "zsync_url": zsync_asset.browser_download_url if zsync_asset else None
+                    }
+                    
+                    self.update_found.emit(update_data)
+                    
+                    if correct_package_name:
+                        self.repo_store.update(
+                            repo['name'], correct_package_name=correct_package_name
+                        )
+                        return True
+                        
+            except Exception as e:
+                self.error.emit(f"Error updating {repo['name']}: {str(e)}")
+                logging.error(f"Error updating {repo['name']}: {e}")
+                self.repo_store.record_check(repo['name'], repo['version'], error=str(e))
+                self.postpone(repo)
+            return False
+
+        def postpone(self, repo):
+            """Retry a failing repository after the shortest check interval"""
+            schedule = dict(self.schedules.get(repo['url']) or {'release_times': []})
+            schedule['next_check'] = time.time() + MIN_CHECK_INTERVAL
+            self.repo_store.save_schedule(repo['url'], schedule)
+
+        @staticmethod
+        def sanitize_package_name(package_name: str) -> str:
+            """Replace version number in package name with *"""
+            import re
+            version_pattern = re.compile(r'\d+(\.\d+)+(-\w+)?')
+            return version_pattern.sub('*', package_name)
+        
+    def check_for_updates(self, repo_names=None):
+        """Check all repositories, or only repo_names, for new releases
+
+        Only one check runs at a time, requests made meanwhile are queued.
+        """
+        if self.check_running:
+            if repo_names is None:
+                self.queued_check_all = True
+            else:
+                self.queued_checks.update(repo_names)
+            return
+        self.settingsButton.setEnabled(False)
+        self.check_running = True
+        # Rows stay in place while checking, the ones of checked repositories that
+        # are not found again are dropped when done
+        self.checked_updates = set()
+        if repo_names is None:
+            self.check_scope = {repo['name'] for repo in self.repo_store.repos()}
+        else:
+            self.check_scope = set(repo_names)
+        # Create thread and worker
+        self.update_thread = QtCore.QThread()
+        max_workers = int(get_setting(self.config_path, 'check_workers', DEFAULT_CHECK_WORKERS))
+        self.update_worker = self.UpdateWorker(
+            self.git, self.repo_store, self.assets, max_workers, repo_names,
+            self.default_check_interval
+        )
+        
+        # Move worker to thread
+        self.update_worker.moveToThread(self.update_thread)
+        
+        # Connect signals
+        self.update_thread.started.connect(self.update_worker.run)
+        self.update_worker.finished.connect(self.update_thread.quit)
+        self.update_worker.finished.connect(self.update_worker.deleteLater)
+        self.update_worker.finished.connect(self.on_update_check_finished)
+        self.update_thread.finished.connect(self.update_thread.deleteLater)
+        
+        self.update_worker.update_found.connect(self.update_updates_ui)
+        self.update_worker.deferred.connect(self.on_checks_deferred)
+        self.update_worker.error.connect(lambda msg: logging.error(msg))
+        
+        # Start thread
+        self.update_thread.start()
+        
+        
+    def on_update_check_finished(self):
+        for name in (self.updates_model.names() & self.check_scope) - self.checked_updates:
+            self.updates_model.remove_update(name)
+        self.check_running = False
+        self.settingsButton.setEnabled(True)
+        if self.queued_check_all or self.queued_checks:
+            repo_names = None if self.queued_check_all else sorted(self.queued_checks)
+            self.queued_check_all, self.queued_checks = False, set()
+            self.check_for_updates(repo_names)
+
+    def on_checks_deferred(self, repo_names, resume_at):
+        self.check_scope.difference_update(repo_names)
+        self.deferred_checks.update(repo_names)
+        # A little past the reset so the new window has started on GitHub's side
+        delay = max(resume_at - time.time(), 0) + RATE_LIMIT_RESUME_MARGIN
+        self.resume_checks_timer.start(int(delay * 1000))
+        resume_time = datetime.fromtimestamp(time.time() + delay).strftime("%H:%M")
+        self.statusBar().showMessage(
+            f"GitHub rate limit reached, {len(self.deferred_checks)} repositories "
+            f"will be checked at {resume_time}"
+        )
+
+    def resume_deferred_checks(self):
+        repo_names, self.deferred_checks = sorted(self.deferred_checks), set()
+        logger.info(f"Rate limit reset, checking {len(repo_names)} deferred repositories")
+        self.check_for_updates(repo_names)
+
+    def update_updates_ui(self, data):
+        if data:
+            data['checked_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.checked_updates.add(data['name'])
+            self.updates_model.add_update(data)
+            
+            auto_update = get_setting_repo(self.repos_path, data['name'], 'auto_update')
+            if auto_update:
+                self.update_repo_from_data(data)
+        else:
+            QtWidgets.QMessageBox.information(self, "No Updates", "No updates available.")
+            
+    def update_repo(self, name, url, path, version, sha256=None, checksum_url=None, zsync_url=None):
+        self.download_queue.enqueue(name, url, path, version, sha256, checksum_url, zsync_url)
+
+    def update_repo_from_data(self, data):
+        self.update_repo(
+            data['name'],
+            data['asset_url'],
+            data['path'],
+            data['new_version'],
+            data.get('sha256'),
+            data.get('checksum_url'),
+            data.get('zsync_url')
+        )
+
+    def on_download_finished(self, name, version):
+        self.updates_model.remove_update(name)
+        self.update_version(name, version)
+
+    def on_download_queue_changed(self, queued, active):
+        message = f"Downloads: {active} active, {queued} queued" if queued or active else ""
+        self.statusBar().showMessage(message)
+        self.tray_icon.setToolTip(f"GitUpdater\n{message}" if message else "GitUpdater")
+
+    def update_version(self, name, version):
+        """Update version in repos.json after successful download"""
+        try:
+            self.repo_store.update(name, version=version)
+            self.git.invalidate_repo(self.repo_store.get(name)['url'])
+            self.update_repo_list()
+            QtWidgets.QMessageBox.information(
+                self, "Update Complete", 
+                f"Repository {name} updated successfully"
+            )
+            
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(
+                self, "Error", 
+                f"Error updating version: {e}"
+            )
+            logging.error(f"Error updating version: {e}")
+        
+    def update_repo_list(self):
+        """Sync the repository list with the store, only changed rows are repainted"""
+        self.repo_model.set_repos(self.repo_store.repos())
+
+    def open_repo_page(self, index):
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl(index.data(RepoListModel.UrlRole)))
+
+    def context_menu(self, pos):
+        index = self.repoListView.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QtWidgets.QMenu(self)
+        repo_name = self.repo_model.repo_name(index)
+
+        # Change Name
+        change_name = QtGui.QAction("Change Name", self)
+        change_name.triggered.connect(lambda: self.change_repo_name_dialog(repo_name))
+        menu.addAction(change_name)
+
+        # Change Path
+        change_path = QtGui.QAction("Change Path", self)
+        change_path.triggered.connect(lambda: self.change_repo_path_dialog(repo_name))
+        menu.addAction(change_path)
+
+        # Change URL 
+        change_url = QtGui.QAction("Change URL", self)
+        change_url.triggered.connect(lambda: self.change_repo_url_dialog(repo_name))
+        menu.addAction(change_url)
+
+        # Delete
+        delete = QtGui.QAction("Delete", self)
+        delete.triggered.connect(lambda: self.delete_repo_dialog(repo_name))
+        menu.addAction(delete)
+
+        menu.exec(QtGui.QCursor.pos())
+    
+    def change_repo_name_dialog(self, name):
+        new_name, ok = QtWidgets.QInputDialog.getText(
+            self, "Change Repository Name", "Enter new name:", text=name
+        )
+        if ok:
+            self.change_repo_name(name, new_name)
+            
+    def change_repo_path_dialog(self, name):
+        new_path = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Directory")
+        if new_path:
+            self.change_local_path(name, new_path)
+            
+    def change_repo_url_dialog(self, name):
+        new_url, ok = QtWidgets.QInputDialog.getText(
+            self, "Change Repository URL", "Enter new URL:"
+        )
+        if ok:
+            self.change_repo_url(name, new_url)
+            
+    def delete_repo_dialog(self, name):
+        result = QtWidgets.QMessageBox.question(
+            self,
+            "Delete Repository",
+            f"Are you sure you want to delete {name}?",
+            QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+            QtWidgets.QMessageBox.StandardButton.No
+        )
+        if result == QtWidgets.QMessageBox.StandardButton.Yes:
+            self.delete_repo(name)
+            
+    def change_local_path(self, name, new_path):
+        try:
+            self.repo_store.update(name, path=new_path)
+            self.update_repo_list()
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error changing local path: {e}")
+            logging.error(f"Error changing local path: {e}")
+
+
+    def change_repo_name(self, old_name, new_name):
+        try:
+            self.repo_store.update(old_name, name=new_name)
+            self.update_repo_list()
+            self.updates_model.rename(old_name, new_name)
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error changing repository name: {e}")
+            logging.error(f"Error changing repository: {e}")
+
+    def change_repo_url(self, name, new_url):
+        try:
+            old_url = self.repo_store.get(name)['url']
+            self.repo_store.update(name, url=new_url)
+            self.git.invalidate_repo(old_url)
+            self.update_repo_list()
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error changing repository URL: {e}")
+            logging.error(f"Error changing repository URL: {e}")
+
+
+    def delete_repo(self, name):
+        try:
+            self.repo_store.remove(name)
+            self.update_repo_list()
+            self.check_for_updates()
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Error deleting repository: {e}")
+            logging.error(f"Error deleting repository: {e}")
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+from src.releases import parse_rate_limit
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+# Requests of each rate limit resource that update checks leave for interactive actions
+INTERACTIVE_RESERVE = 100
+
+
+def prioritize_repos(repos: list, last_checked: dict) -> list:
+    """Order repositories for an update check
+
+    Auto update repositories come first, then the ones that have gone the
+    longest since their last check. Never checked repositories keep file order.
+    """
+    return sorted(
+        repos, key=lambda repo: (not repo.get('auto_update'), last_checked.get(repo['name'], 0))
+    )
+
+
+class RateLimitBudget():
+    """Remaining GitHub API requests per rate limit resource (core, graphql, ...)
+
+    Updated from the X-RateLimit headers of every response. Background checks
+    call acquire before a request, which refuses once only the interactive
+    reserve is left, and resume_at tells when the window resets. A resource
+    that was never seen, or whose reset time has passed, is not limited.
+    """
+
+    def __init__(self, reserve: int = INTERACTIVE_RESERVE, timer=time.time):
+        self.reserve = reserve
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._limits = {}
+
+    def update(self, headers, resource: str = None):
+        """Take the rate limit snapshot of a response, resource defaults to X-RateLimit-Resource"""
+        snapshot = parse_rate_limit(headers)
+        if snapshot is None:
+            return
+        resource = resource or headers.get('X-RateLimit-Resource', 'core')
+        self.set_snapshot(resource, snapshot)
+
+    def set_snapshot(self, resource: str, snapshot: dict):
+        with self._lock:
+            self._limits[resource] = dict(snapshot)
+        if snapshot['remaining'] <= self.reserve:
+            logger.warning(
+                f"GitHub {resource} rate limit low: "
+                f"{snapshot['remaining']} of {snapshot['limit']} left"
+            )
+
+    def _current(self, resource: str):
+        snapshot = self._limits.get(resource)
+        if snapshot is None or snapshot['reset'] <= self.timer():
+            return None
+        return snapshot
+
+    def remaining(self, resource: str = 'core'):
+        """Requests left in the current window, None when unknown"""
+        with self._lock:
+            snapshot = self._current(resource)
+            return snapshot['remaining'] if snapshot else None
+
+    def acquire(self, resource: str = 'core', cost: int = 1, interactive: bool = False) -> bool:
+        """Take cost requests from the budget, False if that would cut into the reserve
+
+        Interactive requests may use the reserve and are only refused once
+        nothing is left.
+        """
+        with self._lock:
+            snapshot = self._current(resource)
+            if snapshot is None:
+                return True
+            floor = 0 if interactive else self.reserve
+            if snapshot['remaining'] - cost < floor:
+                return False
+            snapshot['remaining'] -= cost
+            return True
+
+    def resume_at(self, resource: str = 'core') -> float:
+        """Time the resource resets, now when it is not limited"""
+        with self._lock:
+            snapshot = self._current(resource)
+            return snapshot['reset'] if snapshot else self.timer()
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether a requests exception is GitHub refusing a request for exceeding a rate limit"""
+    response = getattr(error, 'response', None)
+    if response is None or response.status_code not in (403, 429):
+        return False
+    return response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
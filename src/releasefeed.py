@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import threading
+import xml.etree.ElementTree as ElementTree
+
+from src.releases import Release, repo_full_name
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+FEED_BASE_URL = 'https://github.com'
+ATOM_NAMESPACE = '{http://www.w3.org/2005/Atom}'
+# Remembered feed entries, kept next to the cached feed responses
+STATE_FILE = 'release_feeds.json'
+
+
+def parse_newest_entry(feed: bytes):
+    """Get id and updated time of the first entry of an Atom feed, None for an empty feed
+
+    GitHub lists releases newest first and bumps updated when a release is
+    edited, so the pair changes on new releases and on assets added later.
+    """
+    root = ElementTree.fromstring(feed)
+    entry = root.find(f'{ATOM_NAMESPACE}entry')
+    if entry is None:
+        return None
+    return [entry.findtext(f'{ATOM_NAMESPACE}id'), entry.findtext(f'{ATOM_NAMESPACE}updated')]
+
+
+class ReleaseFeed():
+    """Change detector for releases based on the public releases.atom feed of a repository
+
+    Feeds are fetched through an HttpCache, so an unchanged feed costs one 304
+    and no API quota. check returns the release remembered for a repository
+    while its newest feed entry is the one it was fetched with, remember stores
+    a release fetched from the API together with the entry read before the
+    lookup. base_url can point at a local stand-in serving fixture feeds.
+
+    Remembered entries are written to the cache directory by flush, so a feed
+    that did not change since the last run costs no API request either.
+    """
+
+    def __init__(self, http_cache, base_url: str = FEED_BASE_URL):
+        self.http_cache = http_cache
+        self.base_url = base_url.rstrip('/')
+        self.state_path = os.path.join(http_cache.cache_dir, STATE_FILE)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._known = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return {
+                repo_url: (known['entry'], Release.from_rest(known['release']))
+                for repo_url, known in state.items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if os.path.exists(self.state_path):
+                logger.warning(f"Could not read {self.state_path}: {e}")
+            return {}
+
+    def flush(self):
+        """Write the remembered entries if they changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {
+                repo_url: {'entry': entry, 'release': release.to_rest()}
+                for repo_url, (entry, release) in self._known.items()
+            }
+            tmp_path = self.state_path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.state_path)
+                self._dirty = False
+            except OSError as e:
+                logger.error(f"Error saving {self.state_path}: {e}")
+
+    def feed_url(self, repo_url: str) -> str:
+        return f'{self.base_url}/{repo_full_name(repo_url)}/releases.atom'
+
+    def newest_entry(self, repo_url: str):
+        """Newest entry of the feed, None when the feed is empty or cannot be read"""
+        try:
+            return self.http_cache.get_parsed(
+                self.feed_url(repo_url),
+                lambda response: parse_newest_entry(response.content),
+                headers={'Accept': 'application/atom+xml'}
+            )
+        except Exception as e:
+            logger.warning(f"Could not read the release feed of {repo_url}: {e}")
+            return None
+
+    def check(self, repo_url: str) -> tuple:
+        """Read the feed, returns its newest entry and the remembered release if it is unchanged"""
+        entry = self.newest_entry(repo_url)
+        with self._lock:
+            known = self._known.get(repo_url)
+        if entry is not None and known is not None and known[0] == entry:
+            logger.info(f"Release feed of {repo_url} unchanged")
+            return entry, known[1]
+        return entry, None
+
+    def remember(self, repo_url: str, entry, release):
+        """Record release as current for entry, the newest feed entry read before it was fetched"""
+        if entry is None:
+            self.forget(repo_url)
+            return
+        with self._lock:
+            self._known[repo_url] = (entry, release)
+            self._dirty = True
+
+    def forget(self, repo_url: str):
+        with self._lock:
+            if self._known.pop(repo_url, None) is not None:
+                self._dirty = True
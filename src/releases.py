@@ -0,0 +1,278 @@
+import re
+from datetime import datetime
+
+API_URL = 'https://api.github.com'
+GRAPHQL_URL = f'{API_URL}/graphql'
+CHECKSUM_LIST_NAMES = ['sha256sums', 'sha256sums.txt']
+SHA256_PATTERN = re.compile(r'[0-9a-fA-F]{64}')
+# Repositories per aliased GraphQL query, keeps each query well below the node limit
+GRAPHQL_BATCH_SIZE = 50
+
+RELEASE_FIELDS_FRAGMENT = '''
+fragment ReleaseFields on Repository {
+    latestRelease {
+        name
+        tagName
+        url
+        publishedAt
+        releaseAssets(first: 100) {
+            nodes {
+                databaseId
+                name
+                size
+                downloadUrl
+                updatedAt
+                contentType
+                digest
+            }
+        }
+    }
+    releases(first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes {
+            publishedAt
+        }
+    }
+}
+'''
+
+
+def parse_github_datetime(value: str):
+    """Parse an ISO 8601 timestamp as returned by the GitHub API"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def parse_rate_limit(headers) -> dict:
+    """Get the rate limit snapshot from the X-RateLimit headers of an API response
+
+    Returns None when the headers are absent.
+    """
+    if 'X-RateLimit-Limit' not in headers:
+        return None
+    return {
+        'limit': int(headers.get('X-RateLimit-Limit', 0)),
+        'remaining': int(headers.get('X-RateLimit-Remaining', 0)),
+        'used': int(headers.get('X-RateLimit-Used', 0)),
+        'reset': int(headers.get('X-RateLimit-Reset', 0)),
+    }
+
+
+def repo_full_name(repo_url: str) -> str:
+    """Get owner/name from a GitHub repository URL"""
+    parts = repo_url.split('/')
+    return parts[3] + '/' + parts[4]
+
+
+def build_release_query(repo_names: list) -> tuple:
+    """Build an aliased GraphQL query fetching the latest release of every repo
+
+    Returns the query string and its variables, repo i is aliased as r<i>.
+    """
+    params = []
+    fields = []
+    variables = {}
+    for i, repo_name in enumerate(repo_names):
+        owner, name = repo_name.split('/')
+        params.append(f'$o{i}: String!, $n{i}: String!')
+        fields.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...ReleaseFields }}')
+        variables[f'o{i}'] = owner
+        variables[f'n{i}'] = name
+    query = f'query({", ".join(params)}) {{\n' + '\n'.join(fields) + '\n}\n'
+    query += RELEASE_FIELDS_FRAGMENT
+    return query, variables
+
+
+def parse_release_batch(result: dict, repo_names: list) -> dict:
+    """Map the repos of a build_release_query response to their latest release
+
+    Repos without releases map to None, repos GitHub could not resolve are left out.
+    """
+    releases = {}
+    data = result.get('data') or {}
+    for i, repo_name in enumerate(repo_names):
+        repository = data.get(f'r{i}')
+        if repository is None:
+            continue
+        node = repository.get('latestRelease')
+        releases[repo_name] = Release.from_graphql(node, repository) if node else None
+    return releases
+
+
+def filter_platform_assets(assets: list, current_os: str) -> list:
+    """Get the assets that look like they are built for current_os"""
+    os_filtered_assets = []
+    for asset in assets:
+        asset_name = asset.name.lower()
+        if asset_name.endswith('.zsync'):
+            # zsync control files are fetched next to the AppImage they describe
+            continue
+        if current_os in asset_name:
+            os_filtered_assets.append(asset)
+        elif current_os == 'linux' and asset_name.endswith('.appimage'):
+            os_filtered_assets.append(asset)
+        elif current_os == 'windows' and asset_name.endswith('.exe'):
+            os_filtered_assets.append(asset)
+        elif current_os == 'darwin' and asset_name.endswith('.dmg'):
+            os_filtered_assets.append(asset)
+    return os_filtered_assets
+
+
+def match_package_name(assets: list, correct_package_name: str):
+    """Get the first asset matching a package name pattern where * stands for a version"""
+    correct_package_name_pattern = re.escape(correct_package_name).replace(r'\*', r'\d+(\.\d+)*')
+    for asset in assets:
+        if re.match(correct_package_name_pattern, asset.name):
+            return asset
+    return None
+
+
+def get_release_version(asset, release) -> str:
+    """Get the version number from the release title, or the asset upload date"""
+    version_pattern = re.compile(r'\d+(\.\d+)+')
+    match = version_pattern.search(release.title)
+
+    if match:
+        return match.group(0)
+    # If no version number is found, use the upload date
+    return asset.updated_at.astimezone().strftime("%Y-%m-%d")
+
+
+def find_expected_sha256(asset, assets: list) -> tuple:
+    """Get the published SHA-256 of asset, or the URL of a checksum file listing it
+
+    Returns (hex digest, None) when GitHub published a digest for the asset,
+    (None, url) when a <asset>.sha256 or SHA256SUMS sibling exists, else (None, None).
+    """
+    digest = getattr(asset, 'digest', None)
+    if digest and digest.lower().startswith('sha256:'):
+        return digest.split(':', 1)[1].lower(), None
+
+    sidecar_names = [f'{asset.name}.sha256'.lower(), f'{asset.name}.sha256sum'.lower()]
+    for sibling in assets:
+        if sibling.name.lower() in sidecar_names:
+            return None, sibling.browser_download_url
+    for sibling in assets:
+        if sibling.name.lower() in CHECKSUM_LIST_NAMES:
+            return None, sibling.browser_download_url
+    return None, None
+
+
+def parse_checksum_file(text: str, filename: str):
+    """Get the SHA-256 of filename from sha256sum output or a file holding a single digest"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines:
+        parts = line.split(None, 1)
+        if (len(parts) == 2 and parts[1].lstrip('*').strip() == filename
+                and SHA256_PATTERN.fullmatch(parts[0])):
+            return parts[0].lower()
+    if len(lines) == 1:
+        digest = lines[0].split(None, 1)[0]
+        if SHA256_PATTERN.fullmatch(digest):
+            return digest.lower()
+    return None
+
+
+class ReleaseAsset():
+    """Release asset exposing the same attributes as PyGithub's GitReleaseAsset"""
+
+    def __init__(self, id, name, size, browser_download_url, updated_at,
+                 content_type=None, digest=None):
+        self.id = id
+        self.name = name
+        self.size = size
+        self.browser_download_url = browser_download_url
+        self.updated_at = updated_at
+        self.content_type = content_type
+        # GitHub publishes digests as "sha256:<hex>"
+        self.digest = digest
+
+    @classmethod
+    def from_graphql(cls, node: dict):
+        return cls(
+            id=node.get('databaseId'),
+            name=node['name'],
+            size=node.get('size', 0),
+            browser_download_url=node['downloadUrl'],
+            updated_at=parse_github_datetime(node.get('updatedAt')),
+            content_type=node.get('contentType'),
+            digest=node.get('digest')
+        )
+
+    @classmethod
+    def from_rest(cls, data: dict):
+        return cls(
+            id=data.get('id'),
+            name=data['name'],
+            size=data.get('size', 0),
+            browser_download_url=data['browser_download_url'],
+            updated_at=parse_github_datetime(data.get('updated_at')),
+            content_type=data.get('content_type'),
+            digest=data.get('digest')
+        )
+
+    def to_rest(self) -> dict:
+        """Serialize in the REST API shape read by from_rest"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'size': self.size,
+            'browser_download_url': self.browser_download_url,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'content_type': self.content_type,
+            'digest': self.digest
+        }
+
+
+class Release():
+    """Release exposing the same attributes as PyGithub's GitRelease"""
+
+    def __init__(self, title, tag_name, html_url, published_at, assets: list, history: list = None):
+        self.title = title
+        self.tag_name = tag_name
+        self.html_url = html_url
+        self.published_at = published_at
+        self._assets = assets
+        # Publish times of the repository's recent releases, used to schedule checks
+        self.history = history or []
+
+    def get_assets(self) -> list:
+        return self._assets
+
+    @classmethod
+    def from_graphql(cls, node: dict, repository: dict = None):
+        """Build from a latestRelease node
+
+        repository adds the publish times of its recent releases.
+        """
+        asset_nodes = (node.get('releaseAssets') or {}).get('nodes') or []
+        release_nodes = ((repository or {}).get('releases') or {}).get('nodes') or []
+        history = [parse_github_datetime(release.get('publishedAt')) for release in release_nodes]
+        return cls(
+            title=node.get('name') or '',
+            tag_name=node.get('tagName'),
+            html_url=node.get('url'),
+            published_at=parse_github_datetime(node.get('publishedAt')),
+            assets=[ReleaseAsset.from_graphql(asset) for asset in asset_nodes],
+            history=[published_at for published_at in history if published_at]
+        )
+
+    @classmethod
+    def from_rest(cls, data: dict):
+        return cls(
+            title=data.get('name') or '',
+            tag_name=data.get('tag_name'),
+            html_url=data.get('html_url'),
+            published_at=parse_github_datetime(data.get('published_at')),
+            assets=[ReleaseAsset.from_rest(asset) for asset in data.get('assets') or []]
+        )
+
+    def to_rest(self) -> dict:
+        """Serialize in the REST API shape read by from_rest"""
+        return {
+            'name': self.title,
+            'tag_name': self.tag_name,
+            'html_url': self.html_url,
+            'published_at': self.published_at.isoformat() if self.published_at else None,
+            'assets': [asset.to_rest() for asset in self._assets]
+        }
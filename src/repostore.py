@@ -0,0 +1,202 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for more changes before repos.json is written
+FLUSH_DELAY = 1.0
+
+
+class RepoStore():
+    """repos.json loaded once and indexed by repository name and URL
+
+    Changes are made in memory and marked dirty, a debounced timer writes them
+    back in one go through a temporary file that replaces repos.json. Pending
+    changes are flushed at exit. Use RepoStore.open so every part of the app
+    shares the same instance for a file.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, repos_path: str, flush_delay: float = FLUSH_DELAY):
+        self.repos_path = repos_path
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        # Check times and releases are only kept for this run, the SQLite backend persists them
+        self._last_checked = {}
+        self._releases = {}
+        self._load()
+
+    @classmethod
+    def open(cls, repos_path: str) -> 'RepoStore':
+        """Get the shared store of repos_path, loading it on first use"""
+        key = os.path.abspath(repos_path)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls._instances[key] = cls(repos_path)
+                atexit.register(store.close)
+            return store
+
+    def _load(self):
+        if os.path.exists(self.repos_path):
+            with open(self.repos_path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        else:
+            logger.info(f"Creating {self.repos_path}")
+            self._data = {"repos": []}
+            self._dirty = True
+            self.flush()
+        self._data.setdefault('repos', [])
+        self._data.setdefault('schedule', {})
+        self._reindex()
+
+    def _reindex(self):
+        self._by_name = {repo['name']: repo for repo in self._data['repos']}
+        self._by_url = {repo['url']: repo for repo in self._data['repos']}
+
+    def reload(self):
+        """Drop unsaved state and read repos.json again"""
+        with self._lock:
+            self._cancel_timer()
+            self._dirty = False
+            self._load()
+
+    def repos(self) -> list:
+        """Copies of all repositories in file order"""
+        with self._lock:
+            return [dict(repo) for repo in self._data['repos']]
+
+    def get(self, name: str):
+        with self._lock:
+            repo = self._by_name.get(name)
+            return dict(repo) if repo else None
+
+    def get_by_url(self, url: str):
+        with self._lock:
+            repo = self._by_url.get(url)
+            return dict(repo) if repo else None
+
+    def get_setting(self, name: str, setting_name: str):
+        with self._lock:
+            repo = self._by_name.get(name)
+            if repo is None or setting_name not in repo:
+                raise ValueError(f"Setting {setting_name} not found")
+            return repo[setting_name]
+
+    def add(self, repo: dict):
+        with self._lock:
+            if repo['name'] in self._by_name:
+                if self._by_name[repo['name']]['url'] == repo['url']:
+                    raise ValueError("Repository already exists")
+                raise ValueError("Repository with the same name already exists")
+            if repo['url'] in self._by_url:
+                raise ValueError("Repository with the same URL already exists")
+            repo = dict(repo)
+            self._data['repos'].append(repo)
+            self._by_name[repo['name']] = repo
+            self._by_url[repo['url']] = repo
+            self._mark_dirty()
+
+    def update(self, repo_name: str, /, **changes):
+        """Change fields of a repository, renames and URL changes are reindexed"""
+        with self._lock:
+            repo = self._by_name.get(repo_name)
+            if repo is None:
+                raise KeyError(f"Repository {repo_name} not found")
+            new_name = changes.get('name', repo_name)
+            if new_name != repo_name and new_name in self._by_name:
+                raise ValueError("Repository with the same name already exists")
+            new_url = changes.get('url', repo['url'])
+            if new_url != repo['url'] and new_url in self._by_url:
+                raise ValueError("Repository with the same URL already exists")
+            if all(repo.get(key) == value for key, value in changes.items()):
+                return
+            repo.update(changes)
+            if 'name' in changes or 'url' in changes:
+                self._reindex()
+            self._mark_dirty()
+
+    def remove(self, name: str):
+        with self._lock:
+            repo = self._by_name.pop(name, None)
+            if repo is None:
+                return
+            self._data['repos'].remove(repo)
+            self._data['schedule'].pop(repo['url'], None)
+            if self._by_url.get(repo['url']) is repo:
+                del self._by_url[repo['url']]
+            self._releases.pop(repo['url'], None)
+            self._mark_dirty()
+
+    def save_release(self, repo_url: str, release):
+        with self._lock:
+            self._releases[repo_url] = (time.time(), release)
+
+    def get_release(self, repo_url: str, max_age: float = None):
+        """Get the release saved for a repository, None if missing or older than max_age seconds"""
+        with self._lock:
+            fetched_at, release = self._releases.get(repo_url, (0, None))
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        return release
+
+    def record_check(self, repo_name: str, installed_version: str, latest_version: str = None,
+                     error: str = None):
+        with self._lock:
+            self._last_checked[repo_name] = time.time()
+
+    def last_checked(self) -> dict:
+        """Repository name -> time of its last update check"""
+        with self._lock:
+            return dict(self._last_checked)
+
+    def schedules(self) -> dict:
+        """Repository URL -> release times and next check time"""
+        with self._lock:
+            return {url: dict(entry) for url, entry in self._data['schedule'].items()}
+
+    def save_schedule(self, repo_url: str, schedule: dict):
+        with self._lock:
+            self._data['schedule'][repo_url] = dict(schedule)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        self._cancel_timer()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self):
+        """Write pending changes now"""
+        with self._lock:
+            self._cancel_timer()
+            if not self._dirty:
+                return
+            tmp_path = self.repos_path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._data, f, indent=4)
+                os.replace(tmp_path, self.repos_path)
+                self._dirty = False
+            except OSError as e:
+                logger.error(f"Error saving {self.repos_path}: {e}")
+
+    def close(self):
+        self.flush()
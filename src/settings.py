@@ -1,11 +1,11 @@
-import os
 import json
 from PyQt6 import QtWidgets, QtCore
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 from components.settingframe import SettingsFrame
 import logging
 from src.startupservices import manage_startup_service
-from src.utils import get_config_path
+from src.settingsindex import SettingsIndex
+from src.utils import get_config_path, open_repo_store
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w')
 logger = logging.getLogger(__name__)
@@ -51,10 +51,9 @@ class SettingsLoader(QObject):
 
     def _load_repo_category(self):
         try:
-            with open(self.repos_path, 'r') as f:
-                repos_data = json.load(f)
-            if 'repos' in repos_data and repos_data['repos']:
-                self.repo_data_ready.emit(repos_data)
+            repos = open_repo_store(self.repos_path).repos()
+            if repos:
+                self.repo_data_ready.emit({'repos': repos})
         except Exception as e:
             self.error.emit(f"Error loading repository settings: {str(e)}")
 
@@ -102,20 +101,24 @@ class SettingsWindow(QtWidgets.QMainWindow):
         self.save_button.clicked.connect(self.save_settings)
         self.tab_widget.setCornerWidget(self.save_button, QtCore.Qt.Corner.BottomRightCorner)
         self.assets = assets
+        self.repo_tab_widget = None
+        # Repository name -> sub-tab, repo data and the signature its widgets were built from
+        self.repo_tabs = {}
+        self.loaded = False
         
         self.config_path = get_config_path('config.json')
         self.repos_path = get_config_path('repos.json')
 
-    def clear_tabs(self):
-        """Clear all existing tabs"""
-        while self.tab_widget.count() > 0:
-            self.tab_widget.removeTab(0)
-        self.setting_inputs.clear()
-
     def load_settings(self):
-        """Initialize settings loading"""
-        # Clear existing tabs first
-        self.clear_tabs()
+        """Build the tabs on first use, later calls only sync the repository tabs"""
+        if self.loaded:
+            repos = open_repo_store(self.repos_path).repos()
+            if self.repo_tab_widget is not None:
+                self.sync_repo_tabs(repos)
+            elif repos:
+                self.create_repo_widgets({'repos': repos})
+            return
+        self.loaded = True
         
         self.loader_thread = QThread()
         self.loader = SettingsLoader(self)
@@ -131,58 +134,109 @@ class SettingsWindow(QtWidgets.QMainWindow):
         self.loader_thread.start()
         
     def create_repo_widgets(self, repos_data: dict):
-        """Create widgets for repository settings"""
+        """Create the Repositories tab
+
+        The sub-tab of a repository is filled in when it is selected.
+        """
         try:
             repo_tab = QtWidgets.QWidget()
             repo_layout = QtWidgets.QVBoxLayout()
             self.repo_tab_widget = QtWidgets.QTabWidget()
-            
-            for repo in repos_data['repos']:
-                repo_sub_tab = QtWidgets.QWidget()
-                repo_sub_layout = QtWidgets.QVBoxLayout()
-                
-                self.setting_inputs[repo['name']] = {
-                    'widgets': {},
-                    'settings': {}
-                }
-                
-                # Format options correctly
-                asset_options = [{"label": "Auto Detect", "value": "Auto Detect"}]
-                if repo['name'] in self.assets:
-                    asset_options.extend([{"label": asset.name, "value": asset.name} for asset in self.assets[repo['name']]])
-                settings_map = {
-                    'path': ('Path', 'path'),
-                    'url': ('URL', 'url'),
-                    'correct_package_name': ('Correct Package Name', 'select', asset_options),  # Pass formatted options
-                    'version': ('Installed Version', 'text'),
-                    'auto_update': ('Auto Update', 'checkbox')
-                }
-                
-                for key, setting_info in settings_map.items():
-                    label = setting_info[0]
-                    setting_type = setting_info[1]
-                    options = setting_info[2] if len(setting_info) > 2 else None
-                    
-                    setting_frame = SettingsFrame(
-                        label=label,
-                        setting_type=setting_type,
-                        default_value=repo.get(key, ''),
-                        options=options
-                    )
-                    repo_sub_layout.addWidget(setting_frame)
-                    
-                    self.setting_inputs[repo['name']]['settings'][key] = repo.get(key, '')
-                    self.setting_inputs[repo['name']]['widgets'][key] = setting_frame.get_widget()
-                
-                repo_sub_tab.setLayout(repo_sub_layout)
-                self.repo_tab_widget.addTab(repo_sub_tab, repo['name'].split('/')[-1])
-                
+            self.repo_tab_widget.currentChanged.connect(self.build_current_repo_tab)
             repo_layout.addWidget(self.repo_tab_widget)
             repo_tab.setLayout(repo_layout)
             self.tab_widget.addTab(repo_tab, "Repositories")
+            self.sync_repo_tabs(repos_data['repos'])
         except Exception as e:
             logger.error(f"Error creating repository widgets: {e}")
 
+    def repo_signature(self, repo: dict):
+        """What the widgets of a repository tab depend on, the tab is rebuilt when it changes"""
+        asset_names = tuple(asset.name for asset in self.assets.get(repo['name'], []))
+        return json.dumps(repo, sort_keys=True), asset_names
+
+    def sync_repo_tabs(self, repos: list):
+        """Add and remove sub-tabs to match repos
+
+        The widgets of repositories that changed are dropped.
+        """
+        names = {repo['name'] for repo in repos}
+        for name in [name for name in self.repo_tabs if name not in names]:
+            tab = self.repo_tabs.pop(name)['tab']
+            self.repo_tab_widget.removeTab(self.repo_tab_widget.indexOf(tab))
+            tab.deleteLater()
+            self.setting_inputs.pop(name, None)
+
+        for position, repo in enumerate(repos):
+            entry = self.repo_tabs.get(repo['name'])
+            if entry is None:
+                tab = QtWidgets.QWidget()
+                tab.setObjectName(repo['name'])
+                tab.setLayout(QtWidgets.QVBoxLayout())
+                self.repo_tabs[repo['name']] = {'tab': tab, 'repo': repo, 'signature': None}
+                self.repo_tab_widget.insertTab(position, tab, repo['name'].split('/')[-1])
+                continue
+            entry['repo'] = repo
+            if entry['signature'] is not None and entry['signature'] != self.repo_signature(repo):
+                self.clear_repo_tab(repo['name'])
+        self.build_current_repo_tab()
+
+    def clear_repo_tab(self, name: str):
+        entry = self.repo_tabs[name]
+        layout = entry['tab'].layout()
+        while layout.count():
+            layout.takeAt(0).widget().deleteLater()
+        entry['signature'] = None
+        self.setting_inputs.pop(name, None)
+
+    def build_current_repo_tab(self, index: int = None):
+        """Create the setting widgets of the selected repository if they are not built yet"""
+        tab = self.repo_tab_widget.currentWidget()
+        entry = self.repo_tabs.get(tab.objectName()) if tab else None
+        if entry is None or entry['signature'] is not None:
+            return
+        repo = entry['repo']
+        try:
+            self.setting_inputs[repo['name']] = {
+                'widgets': {},
+                'settings': {}
+            }
+            
+            # Format options correctly
+            asset_options = [{"label": "Auto Detect", "value": "Auto Detect"}]
+            if repo['name'] in self.assets:
+                asset_options.extend([
+                    {"label": asset.name, "value": asset.name}
+                    for asset in self.assets[repo['name']]
+                ])
+            settings_map = {
+                'path': ('Path', 'path'),
+                'url': ('URL', 'url'),
+                # Pass formatted options
+                'correct_package_name': ('Correct Package Name', 'select', asset_options),
+                'version': ('Installed Version', 'text'),
+                'auto_update': ('Auto Update', 'checkbox')
+            }
+            
+            for key, setting_info in settings_map.items():
+                label = setting_info[0]
+                setting_type = setting_info[1]
+                options = setting_info[2] if len(setting_info) > 2 else None
+                
+                setting_frame = SettingsFrame(
+                    label=label,
+                    setting_type=setting_type,
+                    default_value=repo.get(key, ''),
+                    options=options
+                )
+                tab.layout().addWidget(setting_frame)
+                
+                self.setting_inputs[repo['name']]['settings'][key] = repo.get(key, '')
+                self.setting_inputs[repo['name']]['widgets'][key] = setting_frame.get_widget()
+            entry['signature'] = self.repo_signature(repo)
+        except Exception as e:
+            logger.error(f"Error creating widgets for {repo['name']}: {e}")
+
     def create_category_widgets(self, category: str, settings_data: dict):
         """Create widgets in the main thread"""
         try:
@@ -266,27 +320,30 @@ class SettingsWindow(QtWidgets.QMainWindow):
                 f.seek(0)
                 json.dump(config, f, indent=4)
                 f.truncate()
+            # Subscribers such as the update check scheduler pick up the new values
+            SettingsIndex.open(self.config_path).refresh()
 
             # Save repository settings to repos.json
-            with open(self.repos_path, 'r+') as f:
-                repos_data = json.load(f)
-                
-                for repo in repos_data['repos']:
-                    repo_name = repo['name']
-                    if repo_name in self.setting_inputs:
-                        widgets = self.setting_inputs[repo_name]['widgets']
-                        
-                        for key, widget in widgets.items():
-                            if isinstance(widget, QtWidgets.QCheckBox):
-                                repo[key] = widget.isChecked()
-                            elif isinstance(widget, QtWidgets.QComboBox):
-                                repo[key] = widget.currentText()
-                            else:
-                                repo[key] = widget.text()
-
-                f.seek(0)
-                json.dump(repos_data, f, indent=4)
-                f.truncate()
+            repo_store = open_repo_store(self.repos_path)
+            for repo in repo_store.repos():
+                repo_name = repo['name']
+                if repo_name in self.setting_inputs:
+                    widgets = self.setting_inputs[repo_name]['widgets']
+                    changes = {}
+                    
+                    for key, widget in widgets.items():
+                        if isinstance(widget, QtWidgets.QCheckBox):
+                            changes[key] = widget.isChecked()
+                        elif isinstance(widget, QtWidgets.QComboBox):
+                            changes[key] = widget.currentText()
+                        else:
+                            changes[key] = widget.text()
+                    repo_store.update(repo_name, **changes)
+                    # The tab already shows the saved values, keep it on the next sync
+                    entry = self.repo_tabs[repo_name]
+                    entry['repo'] = repo_store.get(repo_name)
+                    entry['signature'] = self.repo_signature(entry['repo'])
+            repo_store.flush()
 
             QtWidgets.QMessageBox.information(self, "Success", "Settings saved successfully")
             logging.info("Settings saved successfully")
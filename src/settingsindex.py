@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import threading
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def resolve_setting(setting: dict):
+    """Get the effective value of a config.json setting entry"""
+    setting_type = setting.get('type')
+
+    # Non-select settings: prefer explicit "value" if present, otherwise fall back to default.
+    if setting_type != 'select':
+        if 'value' in setting:
+            return setting['value']
+        return setting.get('default')
+
+    # Select settings: the settings window saves the chosen label as "value", the
+    # template holds a label as "default". Either may also be an option value.
+    selected = setting.get('value', setting.get('default'))
+    options = setting.get('options') or []
+
+    # 1) Match by label
+    for option in options:
+        if option.get('label') == selected:
+            return option.get('value')
+
+    # 2) Match by value
+    for option in options:
+        if str(option.get('value')) == str(selected):
+            return option.get('value')
+
+    # 3) Common "Never/Off/None" convention for intervals -> 0
+    if isinstance(selected, str) and selected.strip().lower() in {"never", "off", "none"}:
+        return "0"
+
+    # 4) Last resort: if there's an obvious first option, use it
+    if options:
+        return options[0].get('value')
+    return None
+
+
+class SettingsIndex():
+    """config.json parsed once into a flat name to value index
+
+    The file is parsed again only when its modification time or size changes.
+    Callbacks registered with subscribe are called with the setting name and new
+    value whenever a refresh finds that setting changed. Use SettingsIndex.open
+    so every part of the app shares the same index for a file.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._lock = threading.RLock()
+        self._signature = None
+        self._values = {}
+        self._subscribers = {}
+
+    @classmethod
+    def open(cls, config_path: str) -> 'SettingsIndex':
+        key = os.path.abspath(config_path)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(config_path)
+            return index
+
+    def _parse(self) -> dict:
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        values = {}
+        for category in data['categories']:
+            if 'General' not in category:
+                continue
+            settings = category['General'][0]['settings'][0]
+            for name, entries in settings.items():
+                if name not in values and isinstance(entries, list) and entries:
+                    values[name] = resolve_setting(entries[0])
+        return values
+
+    def refresh(self, force: bool = False):
+        """Parse config.json again if it changed on disk
+
+        Subscribers of the settings that changed are notified afterwards.
+        """
+        with self._lock:
+            stat = os.stat(self.config_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature and not force:
+                return
+            values = self._parse()
+            first_load = self._signature is None
+            old_values, self._values, self._signature = self._values, values, signature
+            if first_load:
+                return
+            changed = [
+                name for name in values.keys() | old_values.keys()
+                if values.get(name) != old_values.get(name)
+            ]
+            callbacks = [
+                (name, callback)
+                for name in changed for callback in self._subscribers.get(name, [])
+            ]
+
+        for name in changed:
+            logger.info(f"Setting {name} changed to {values.get(name)}")
+        for name, callback in callbacks:
+            try:
+                callback(name, values.get(name))
+            except Exception as e:
+                logger.error(f"Error in settings subscriber for {name}: {e}")
+
+    def get(self, setting_name: str, default=_MISSING):
+        self.refresh()
+        with self._lock:
+            if setting_name in self._values:
+                return self._values[setting_name]
+        if default is not _MISSING:
+            return default
+        raise ValueError(f"Setting {setting_name} not found")
+
+    def subscribe(self, setting_name: str, callback):
+        """Call callback(name, value) after setting_name changes
+
+        The callback runs on the thread that noticed the change.
+        """
+        with self._lock:
+            self._subscribers.setdefault(setting_name, []).append(callback)
+
+    def unsubscribe(self, setting_name: str, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(setting_name, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
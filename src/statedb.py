@@ -0,0 +1,306 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from src.releases import Release
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+# Milliseconds a connection waits for another process holding the write lock
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS repos (
+    position INTEGER NOT NULL,
+    name TEXT PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS releases (
+    repo_url TEXT PRIMARY KEY,
+    tag_name TEXT,
+    published_at TEXT,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS check_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo_name TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    installed_version TEXT,
+    latest_version TEXT,
+    update_found INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS schedule (
+    repo_url TEXT PRIMARY KEY,
+    release_times TEXT NOT NULL,
+    next_check REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS check_history_repo ON check_history (repo_name, checked_at);
+"""
+
+
+def file_signature(path: str):
+    """Modification time and size of path, None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class StateDatabase():
+    """SQLite store for repositories, their latest releases, check schedules and history
+
+    Drop-in replacement for RepoStore selected with the storage_backend setting.
+    The database runs in WAL mode so the GUI and a headless run can use it at
+    the same time, every change is committed right away and lookups go through
+    the primary key or the unique URL index. The database remembers the
+    repos.json it last synced with, import_json takes the file over when it was
+    changed since and export_json writes changes back for the JSON backend.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: str, import_path: str = None):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        if import_path:
+            self.import_json(import_path)
+
+    @classmethod
+    def open(cls, db_path: str, import_path: str = None) -> 'StateDatabase':
+        """Get the shared database of db_path, importing import_path on first use"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            db = cls._instances.get(key)
+            if db is None:
+                db = cls._instances[key] = cls(db_path, import_path)
+                atexit.register(db.close)
+            return db
+
+    def _get_meta(self, key: str):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def _mark_changed(self):
+        # Tells export_json that repos.json is behind the database
+        self._set_meta('repos_changed', '1')
+
+    def _mark_synced(self, repos_path: str):
+        self._set_meta('repos_json_signature', json.dumps(file_signature(repos_path)))
+        self._set_meta('repos_changed', '0')
+
+    def import_json(self, repos_path: str):
+        """Replace the repositories with those of repos.json if it changed since the last sync
+
+        The database is kept when the file does not exist or when it has changes
+        that were not exported to repos.json yet.
+        """
+        with self._lock, self._conn:
+            # BEGIN IMMEDIATE so two processes starting together do not both import
+            self._conn.execute('BEGIN IMMEDIATE')
+            signature = file_signature(repos_path)
+            if signature is None or self._get_meta('repos_json_signature') == json.dumps(signature):
+                return
+            if self._get_meta('repos_changed') == '1':
+                logger.warning(
+                    f"{repos_path} changed while the database has changes that were not "
+                    f"exported, keeping the database"
+                )
+                return
+            with open(repos_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            repos = data.get('repos', [])
+            self._conn.execute('DELETE FROM repos')
+            for position, repo in enumerate(repos):
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO repos (position, name, url, data) VALUES (?, ?, ?, ?)',
+                    (position, repo['name'], repo['url'], json.dumps(repo))
+                )
+            self._conn.execute('DELETE FROM schedule')
+            for repo_url, schedule in data.get('schedule', {}).items():
+                self._save_schedule(repo_url, schedule)
+            self._mark_synced(repos_path)
+            logger.info(f"Imported {len(repos)} repositories from {repos_path}")
+
+    def export_json(self, repos_path: str):
+        """Write the repositories back to repos.json if they changed since the last sync"""
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            if self._get_meta('repos_changed') != '1':
+                return
+            data = {}
+            if os.path.exists(repos_path):
+                with open(repos_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            data['repos'] = self.repos()
+            data['schedule'] = self.schedules()
+            tmp_path = repos_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, repos_path)
+            self._mark_synced(repos_path)
+            logger.info(f"Exported {len(data['repos'])} repositories to {repos_path}")
+
+    def _fetch_repo(self, column: str, value: str):
+        row = self._conn.execute(f'SELECT data FROM repos WHERE {column} = ?', (value,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def repos(self) -> list:
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM repos ORDER BY position').fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, name: str):
+        with self._lock:
+            return self._fetch_repo('name', name)
+
+    def get_by_url(self, url: str):
+        with self._lock:
+            return self._fetch_repo('url', url)
+
+    def get_setting(self, name: str, setting_name: str):
+        repo = self.get(name)
+        if repo is None or setting_name not in repo:
+            raise ValueError(f"Setting {setting_name} not found")
+        return repo[setting_name]
+
+    def add(self, repo: dict):
+        with self._lock, self._conn:
+            existing = self._fetch_repo('name', repo['name'])
+            if existing:
+                if existing['url'] == repo['url']:
+                    raise ValueError("Repository already exists")
+                raise ValueError("Repository with the same name already exists")
+            if self._fetch_repo('url', repo['url']):
+                raise ValueError("Repository with the same URL already exists")
+            position = self._conn.execute(
+                'SELECT COALESCE(MAX(position) + 1, 0) FROM repos'
+            ).fetchone()[0]
+            self._conn.execute(
+                'INSERT INTO repos (position, name, url, data) VALUES (?, ?, ?, ?)',
+                (position, repo['name'], repo['url'], json.dumps(repo))
+            )
+            self._mark_changed()
+
+    def update(self, repo_name: str, /, **changes):
+        with self._lock, self._conn:
+            repo = self._fetch_repo('name', repo_name)
+            if repo is None:
+                raise KeyError(f"Repository {repo_name} not found")
+            if all(repo.get(key) == value for key, value in changes.items()):
+                return
+            repo.update(changes)
+            try:
+                self._conn.execute(
+                    'UPDATE repos SET name = ?, url = ?, data = ? WHERE name = ?',
+                    (repo['name'], repo['url'], json.dumps(repo), repo_name)
+                )
+            except sqlite3.IntegrityError as e:
+                raise ValueError("Repository with the same name or URL already exists") from e
+            self._mark_changed()
+
+    def remove(self, name: str):
+        with self._lock, self._conn:
+            repo = self._fetch_repo('name', name)
+            if repo is None:
+                return
+            self._conn.execute('DELETE FROM repos WHERE name = ?', (name,))
+            self._conn.execute('DELETE FROM schedule WHERE repo_url = ?', (repo['url'],))
+            self._conn.execute('DELETE FROM releases WHERE repo_url = ?', (repo['url'],))
+            self._mark_changed()
+
+    def save_release(self, repo_url: str, release: Release):
+        """Keep the latest release of a repository and its assets for later runs"""
+        published_at = release.published_at.isoformat() if release.published_at else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO releases '
+                '(repo_url, tag_name, published_at, fetched_at, data) VALUES (?, ?, ?, ?, ?)',
+                (repo_url, release.tag_name, published_at, time.time(),
+                 json.dumps(release.to_rest()))
+            )
+
+    def get_release(self, repo_url: str, max_age: float = None):
+        """Get the stored release of a repository, None if missing or older than max_age seconds"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT fetched_at, data FROM releases WHERE repo_url = ?', (repo_url,)
+            ).fetchone()
+        if not row or (max_age is not None and time.time() - row[0] > max_age):
+            return None
+        return Release.from_rest(json.loads(row[1]))
+
+    def record_check(self, repo_name: str, installed_version: str, latest_version: str = None,
+                     error: str = None):
+        update_found = bool(latest_version) and latest_version != installed_version
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO check_history (repo_name, checked_at, installed_version, '
+                'latest_version, update_found, error) VALUES (?, ?, ?, ?, ?, ?)',
+                (repo_name, time.time(), installed_version, latest_version, int(update_found),
+                 error)
+            )
+
+    def last_checked(self) -> dict:
+        """Repository name -> time of its last update check"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT repo_name, MAX(checked_at) FROM check_history GROUP BY repo_name'
+            ).fetchall()
+        return dict(rows)
+
+    def schedules(self) -> dict:
+        """Repository URL -> release times and next check time"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT repo_url, release_times, next_check FROM schedule'
+            ).fetchall()
+        return {
+            url: {'release_times': json.loads(times), 'next_check': next_check}
+            for url, times, next_check in rows
+        }
+
+    def _save_schedule(self, repo_url: str, schedule: dict):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO schedule (repo_url, release_times, next_check) '
+            'VALUES (?, ?, ?)',
+            (repo_url, json.dumps(schedule['release_times']), schedule['next_check'])
+        )
+
+    def save_schedule(self, repo_url: str, schedule: dict):
+        with self._lock, self._conn:
+            self._save_schedule(repo_url, schedule)
+            self._mark_changed()
+
+    def flush(self):
+        """Changes are committed immediately, kept for RepoStore compatibility"""
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,12 +1,10 @@
 import os
-import sys
-import json
 import logging
-import requests
-import patoolib
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from src.utils import get_config_path, get_setting_repo
+from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from PyQt6.QtWidgets import QMessageBox
+from src.blobcache import BlobCache
+from src.downloads import DEFAULT_SEGMENT_THRESHOLD_MB, Downloader
+from src.utils import get_config_path
 from src.githubAuth import GitHub
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w')
@@ -14,134 +12,41 @@ logger = logging.getLogger(__name__)
 
 repo_path = get_config_path('repos.json')
 class DownloadWorker(QObject):
+    """Runs a Downloader on a QThread and reports through signals"""
     progress = pyqtSignal(int)
     finished = pyqtSignal()
     error = pyqtSignal(str)
     
-    def __init__(self, url: str, path: str):
+    def __init__(self, url: str, path: str,
+                 segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD_MB * 1024 * 1024,
+                 stream_extract: bool = True, expected_sha256: str = None, checksum_url: str = None,
+                 blob_cache: BlobCache = None, zsync_url: str = None):
         super().__init__()
         self.url = url
         self.path = path
+        self.failed = False
+        self.downloader = Downloader(
+            url,
+            path,
+            segment_threshold,
+            stream_extract,
+            expected_sha256,
+            checksum_url,
+            blob_cache,
+            zsync_url,
+            on_progress=self.progress.emit
+        )
         
     def run(self):
         try:
-            # Create all necessary directories
-            os.makedirs(self.path, exist_ok=True)
-            
-            # Get filename from URL and create full download path
-            filename = os.path.basename(self.url)
-            full_path = os.path.join(self.path, filename)
-            
-            logger.info(f"Downloading to: {full_path}")
-            
-            # Download file
-            response = requests.get(self.url, stream=True)
-            response.raise_for_status()
-            
-            # Get total file size
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            last_progress = -1  # Track last reported progress
-            
-            with open(full_path, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
-                    downloaded += len(chunk)
-                    current_progress = int(downloaded / total_size * 100)
-                    
-                    # Only emit if progress changed by >= 1%
-                    if current_progress > last_progress:
-                        self.progress.emit(current_progress)
-                        last_progress = current_progress
-            
-            filetype = filename.split('.')[-1]
-            if filetype in ['zip', 'tar', 'gz', 'bz2', '7z']:
-                try:
-                    logger.info(f"Extracting {filetype} archive")
-                    patoolib.extract_archive(full_path, outdir=self.path)
-                    os.remove(full_path)
-                except Exception as e:
-                    logger.error(f"Error during extraction: {e}")
-                    self.error.emit(str(e))
-            self.finished.emit()
-            
+            self.downloader.run()
         except Exception as e:
             logger.error(f"Error during download/extract: {e}")
+            self.failed = True
             self.error.emit(str(e))
+        # Always finish so the owning thread quits and queued downloads can start
+        self.finished.emit()
 
-def run_headless_updates(git: GitHub, repos_path: str):
-    app = QApplication(sys.argv)
-    
-    def log_progress(p):
-        logger.info(f"Download progress for {current_repo}: {p}%")
-        
-    def log_error(e):
-        logger.error(f"Download error for {current_repo}: {e}")
-        
-    def quit_app():
-        logger.info("Quitting application")
-        app.quit()
-
-    def on_worker_finished():
-        logger.info("Worker finished")
-        thread.quit()
-    
-    try:
-        # Check if repos.json exists
-        if not os.path.exists(repos_path):
-            logger.error(f"repos.json not found at {repos_path}")
-            with open(repos_path, 'w') as f:
-                json.dump({"repos": []}, f, indent=4)
-            logger.info(f"Created default repos.json at {repos_path}")
-            quit_app()
-        
-        with open(repos_path, 'r') as f:
-            data = json.load(f)
-            repos = data.get('repos', [])
-            
-            for repo in repos:
-                if get_setting_repo(repos_path, repo['name'], 'auto_update'):
-                    current_repo = repo['name']
-                    logger.info(f"Checking update for {current_repo}")
-                    latest_release = git.get_latest_release_url(repo['url'])
-                    asset, _ = git.find_correct_asset_in_list(
-                        latest_release, 
-                        None,
-                        get_setting_repo(repos_path, repo['name'], 'correct_package_name')
-                    )
-                    
-                    if asset:
-                        version = git.get_asset_version(asset=asset, page=latest_release)
-                        if version != repo['version']:
-                            worker = DownloadWorker(asset.browser_download_url, repo['path'])
-                            thread = QThread()
-                            
-                            worker.moveToThread(thread)
-                            thread.started.connect(worker.run)
-                            worker.progress.connect(log_progress)
-                            worker.error.connect(log_error)
-                            worker.finished.connect(on_worker_finished)
-                            worker.finished.connect(worker.deleteLater)
-                            thread.finished.connect(thread.deleteLater)
-                            
-                            thread.start()
-                            while thread.isRunning():
-                                app.processEvents()
-                            
-                            repo['version'] = version
-                            with open(repos_path, 'w') as f:
-                                json.dump(data, f, indent=4)
-                else:
-                    logger.info(f"Auto update disabled for {repo['name']}. Skipping")
-        logger.info("All updates completed")
-        QTimer.singleShot(0, quit_app)
-        return app.exec()
-        
-    except Exception as e:
-        logger.error(f"Error in headless update: {e}")
-        quit_app()
-        return 1
-    
 def check_for_app_update():
     """Check if the application is up to date"""
     try:
@@ -177,8 +82,13 @@ def update_app(download_url, parent=None):
                 
             def on_worker_finished():
                 logger.info("Worker finished")
+                if worker.failed:
+                    # log_error already told the user
+                    return
                 update_file = os.path.join(os.path.expanduser("~"), "GitUpdater_update.zip")
                 try:
+                    import patoolib
+
                     patoolib.extract_archive(update_file, outdir=os.path.dirname(__file__))
                     os.remove(update_file)
                     QMessageBox.information(parent, "Update", "The application has been updated. Please restart the application.")
@@ -1,57 +1,53 @@
 import os
-import json
+import sys
+import dotenv
 import platform
+import threading
 import platformdirs
+from src.repostore import RepoStore
+from src.settingsindex import _MISSING, SettingsIndex
+from src.statedb import StateDatabase
 
-def get_setting(config_path, setting_name):
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        for category in data['categories']:
-            if 'General' in category:
-                settings = category['General'][0]['settings'][0]
-                if setting_name not in settings:
-                    continue
+def get_setting(config_path, setting_name, default=_MISSING):
+    return SettingsIndex.open(config_path).get(setting_name, default)
 
-                setting = settings[setting_name][0]
-                setting_type = setting.get('type')
+# Repository store of each repos.json, chosen once per process
+_repo_stores = {}
+_repo_stores_lock = threading.Lock()
 
-                # Non-select settings: prefer explicit "value" if present, otherwise fall back to default.
-                if setting_type != 'select':
-                    if 'value' in setting:
-                        return setting['value']
-                    return setting.get('default')
+def open_repo_store(repos_path):
+    """Get the repository store picked by the storage_backend setting
 
-                # Select settings: default may be stored as a label or as a value. Be tolerant.
-                default = setting.get('default')
-                options = setting.get('options') or []
+    The backend is chosen on first use and kept until the app restarts, so every
+    window works on the same store. The SQLite database lives next to repos.json,
+    repositories changed in one backend are carried over when switching to the other.
+    """
+    key = os.path.abspath(repos_path)
+    with _repo_stores_lock:
+        store = _repo_stores.get(key)
+        if store is None:
+            store = _repo_stores[key] = _select_repo_store(repos_path)
+        return store
 
-                # 1) Match by label
-                for option in options:
-                    if option.get('label') == default:
-                        return option.get('value')
-
-                # 2) Match by value
-                for option in options:
-                    if str(option.get('value')) == str(default):
-                        return option.get('value')
-
-                # 3) Common "Never/Off/None" convention for intervals -> 0
-                if isinstance(default, str) and default.strip().lower() in {"never", "off", "none"}:
-                    return "0"
-
-                # 4) Last resort: if there's an obvious first option, use it
-                if options:
-                    return options[0].get('value')
-        raise ValueError(f"Setting {setting_name} not found")
+def _select_repo_store(repos_path):
+    config_dir = os.path.dirname(os.path.abspath(repos_path))
+    config_path = os.path.join(config_dir, 'config.json')
+    db_path = os.path.join(config_dir, 'state.db')
+    backend = 'json'
+    if os.path.exists(config_path):
+        backend = get_setting(config_path, 'storage_backend', 'json')
+    if backend == 'sqlite':
+        return StateDatabase.open(db_path, import_path=repos_path)
+    if os.path.exists(db_path):
+        db = StateDatabase(db_path)
+        try:
+            db.export_json(repos_path)
+        finally:
+            db.close()
+    return RepoStore.open(repos_path)
 
 def get_setting_repo(repos_path, repo_name, setting_name):
-    with open(repos_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        for repo in data['repos']:
-            if repo['name'] == repo_name:
-                if setting_name in repo:
-                    return repo[setting_name]
-        raise ValueError(f"Setting {setting_name} not found")
+    return open_repo_store(repos_path).get_setting(repo_name, setting_name)
     
 def get_config_dir():
     """Get user config directory"""
@@ -66,4 +62,20 @@ def get_config_dir():
 
 def get_config_path(filename):
     """Get full path for a config file"""
-    return os.path.join(get_config_dir(), filename)
\ No newline at end of file
+    return os.path.join(get_config_dir(), filename)
+
+def resource_path(relative_path):
+    """Get absolute path to resource for both dev and packaged versions"""
+    if hasattr(sys, '_MEIPASS'):
+        # Running in PyInstaller bundle
+        return os.path.join(sys._MEIPASS, relative_path)
+    # Running in development
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
+
+def load_github_token():
+    """Get the GitHub access token from the .env file shipped with the app or the environment"""
+    dotenv.load_dotenv(resource_path('.env'))
+    token = os.getenv("GITHUB_ACCESS_TOKEN")
+    if not token:
+        raise ValueError("GitHub access token not found in .env or the environment")
+    return token
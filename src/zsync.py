@@ -0,0 +1,347 @@
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+from itertools import accumulate
+
+logging.basicConfig(
+    level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%d-%b-%y %H:%M:%S', filename='gitupdater.log', filemode='w'
+)
+logger = logging.getLogger(__name__)
+
+# Fall back to a full download when the delta would still fetch more than this share of the file
+MAX_DELTA_FRACTION = 0.8
+# Missing ranges closer than this many blocks are fetched in one request
+RANGE_MERGE_GAP_BLOCKS = 4
+# Seed regions matched before the full scan to tell whether it is worth running
+SAMPLE_COUNT = 16
+SAMPLE_BLOCKS = 32
+# Seed bytes the rolling checksum may step over one at a time, about 15 s of Python,
+# blocks not found by then are downloaded
+MAX_ROLLING_BYTES = 16 * 1024 * 1024
+# Weak checksum bits of a block and its successor that are trusted without MD4
+# for the next block of a run that already matched
+TRUSTED_WEAK_BITS = 32
+
+
+def find_zsync_asset(asset, assets: list):
+    """Get the .zsync control file published next to asset, None if there is none"""
+    zsync_name = f'{asset.name}.zsync'.lower()
+    return next((sibling for sibling in assets if sibling.name.lower() == zsync_name), None)
+
+
+def seed_name_prefix(filename: str) -> str:
+    """Name of an asset up to its version, 'MyApp' for MyApp-v1.2.0-x86_64.AppImage"""
+    match = re.match(r'(.*?)(?:[-_. ]v?)?\d', filename)
+    name = match.group(1) if match else os.path.splitext(filename)[0]
+    return name.lower()
+
+
+def find_seed_file(path: str, filename: str):
+    """Get the installed AppImage in path whose blocks can be reused, None if there is none
+
+    Other apps can be installed in the same directory, so only an AppImage
+    whose name starts like filename before the version is considered.
+    """
+    if not os.path.isdir(path):
+        return None
+    prefix = seed_name_prefix(filename)
+    if not prefix:
+        return None
+    candidates = [
+        os.path.join(path, entry) for entry in os.listdir(path)
+        if entry.lower().endswith('.appimage') and entry.lower().startswith(prefix)
+        and os.path.isfile(os.path.join(path, entry))
+    ]
+    exact = os.path.join(path, filename)
+    if exact in candidates:
+        return exact
+    return max(candidates, key=os.path.getmtime, default=None)
+
+
+def _rotate_left(x: int, n: int) -> int:
+    return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+
+def _md4_python(data: bytes) -> bytes:
+    """MD4 for OpenSSL builds that no longer ship it, zsync uses it for block checksums"""
+    message = bytearray(data)
+    bit_length = len(data) * 8
+    message.append(0x80)
+    message.extend(b'\x00' * ((56 - len(message) % 64) % 64))
+    message += struct.pack('<Q', bit_length & 0xFFFFFFFFFFFFFFFF)
+
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476]
+    rounds = (
+        (lambda x, y, z: (x & y) | (~x & z), 0, range(16), (3, 7, 11, 19)),
+        (lambda x, y, z: (x & y) | (x & z) | (y & z), 0x5A827999,
+         (0, 4, 8, 12, 1, 5, 9, 13, 2, 6, 10, 14, 3, 7, 11, 15), (3, 5, 9, 13)),
+        (lambda x, y, z: x ^ y ^ z, 0x6ED9EBA1,
+         (0, 8, 4, 12, 2, 10, 6, 14, 1, 9, 5, 13, 3, 11, 7, 15), (3, 9, 11, 15)),
+    )
+    for offset in range(0, len(message), 64):
+        words = struct.unpack('<16I', message[offset:offset + 64])
+        a, b, c, d = state
+        for func, constant, order, shifts in rounds:
+            for i, k in enumerate(order):
+                value = (a + func(b, c, d) + words[k] + constant) & 0xFFFFFFFF
+                value = _rotate_left(value, shifts[i % 4])
+                a, b, c, d = d, value, b, c
+        state = [(s + v) & 0xFFFFFFFF for s, v in zip(state, (a, b, c, d), strict=True)]
+    return struct.pack('<4I', *state)
+
+
+def md4(data: bytes) -> bytes:
+    try:
+        return hashlib.new('md4', data).digest()
+    except ValueError:
+        return _md4_python(data)
+
+
+def rsum(block: bytes) -> tuple:
+    """zsync's rolling checksum of a block, a is the byte sum and b the sum of the prefix sums"""
+    return sum(block) & 0xFFFF, sum(accumulate(block)) & 0xFFFF
+
+
+class ZsyncControl():
+    """Parsed .zsync control file"""
+
+    def __init__(self, data: bytes):
+        header, separator, body = data.partition(b'\n\n')
+        if not separator:
+            raise ValueError("Invalid zsync file: missing header terminator")
+        self.headers = {}
+        for line in header.decode('utf-8').splitlines():
+            key, _, value = line.partition(':')
+            self.headers[key.strip().lower()] = value.strip()
+
+        self.blocksize = int(self.headers['blocksize'])
+        self.length = int(self.headers['length'])
+        self.sha1 = self.headers.get('sha-1', '').lower() or None
+        hash_lengths = self.headers['hash-lengths'].split(',')
+        seq_matches, rsum_bytes, checksum_bytes = (int(v) for v in hash_lengths)
+        self.seq_matches = seq_matches
+        self.rsum_bytes = rsum_bytes
+        self.checksum_bytes = checksum_bytes
+        self.rsum_mask = (1 << (8 * rsum_bytes)) - 1
+
+        self.block_count = -(-self.length // self.blocksize)
+        entry_size = rsum_bytes + checksum_bytes
+        if len(body) < self.block_count * entry_size:
+            raise ValueError("Invalid zsync file: truncated block checksums")
+        self.rsums = []
+        self.checksums = []
+        for i in range(self.block_count):
+            entry = body[i * entry_size:(i + 1) * entry_size]
+            self.rsums.append(int.from_bytes(entry[:rsum_bytes], 'big'))
+            self.checksums.append(entry[rsum_bytes:])
+        self.blocks_by_rsum = {}
+        for index, weak in enumerate(self.rsums):
+            self.blocks_by_rsum.setdefault(weak, []).append(index)
+
+    def weak(self, a: int, b: int) -> int:
+        return ((a << 16) | b) & self.rsum_mask
+
+    def strong(self, block: bytes) -> bytes:
+        if len(block) < self.blocksize:
+            block = block + b'\x00' * (self.blocksize - len(block))
+        return md4(block)[:self.checksum_bytes]
+
+
+class ZsyncDelta():
+    """Build a new file from the blocks of an old one, fetching only the changed ranges
+
+    The .zsync control file lists a rolling and an MD4 checksum for every block of
+    the new file. Blocks found anywhere in the seed file are copied locally, the
+    rest is requested from url with HTTP Range requests.
+    """
+
+    def __init__(self, control: ZsyncControl, url: str, seed_path: str, full_path: str):
+        self.control = control
+        self.url = url
+        self.seed_path = seed_path
+        self.full_path = full_path
+        self.part_path = full_path + '.zsync-part'
+        self.fetched_bytes = 0
+
+    def scan(self, seed, start: int, end: int, max_rolling: int = None):
+        """Yield the seed offsets between start and end holding a block of the new file
+
+        Each match comes with the indices of the blocks it equals. The rolling
+        checksum steps one byte at a time where nothing matches, after max_rolling
+        such steps the scan gives up on the rest of the range.
+        """
+        control = self.control
+        blocksize = control.blocksize
+        block_count = control.block_count
+        rsums = control.rsums
+        table = control.blocks_by_rsum
+        # With seq_matches 2 a block only counts when the block after it matches too
+        check_next = control.seq_matches > 1
+        weak_bits = control.rsum_bytes * 8 * control.seq_matches
+        trust_runs = check_next and weak_bits >= TRUSTED_WEAK_BITS
+        end = min(end, len(seed))
+
+        def window(offset):
+            block = seed[offset:offset + blocksize]
+            return block + b'\x00' * (blocksize - len(block))
+
+        x = start
+        rolled = 0
+        # Block matched right before x, its successor is the likely next match
+        previous = None
+        a, b = rsum(window(x))
+        while x + blocksize <= end:
+            weak = control.weak(a, b)
+            matches = []
+            # Checksum of the block after x, kept for the jump after a match
+            next_sum = None
+            run_next = previous + 1 if trust_runs and previous is not None else block_count
+            if run_next < block_count and rsums[run_next] == weak:
+                if run_next + 1 < block_count:
+                    next_sum = rsum(window(x + blocksize))
+                if run_next + 1 >= block_count or rsums[run_next + 1] == control.weak(*next_sum):
+                    matches.append(run_next)
+            if not matches and weak in table:
+                strong = None
+                for index in table[weak]:
+                    if check_next and index + 1 < block_count:
+                        if next_sum is None:
+                            next_sum = rsum(window(x + blocksize))
+                        if rsums[index + 1] != control.weak(*next_sum):
+                            continue
+                    if strong is None:
+                        strong = control.strong(seed[x:x + blocksize])
+                    if strong == control.checksums[index]:
+                        matches.append(index)
+            if matches:
+                yield x, matches
+                previous = matches[0]
+                x += blocksize
+                a, b = next_sum or rsum(window(x))
+                continue
+
+            previous = None
+            rolled += 1
+            if max_rolling is not None and rolled > max_rolling:
+                seed_name = os.path.basename(self.seed_path)
+                logger.info(f"zsync stopped scanning {seed_name} at byte {x}")
+                return
+            old = seed[x]
+            new = seed[x + blocksize] if x + blocksize < len(seed) else 0
+            a = (a - old + new) & 0xFFFF
+            b = (b - blocksize * old + a) & 0xFFFF
+            x += 1
+
+    def estimate_reuse(self, seed) -> float:
+        """Share of sampled seed regions found in the new file, 1.0 for seeds too small to sample"""
+        blocksize = self.control.blocksize
+        sample_size = SAMPLE_BLOCKS * blocksize
+        if len(seed) < 2 * SAMPLE_COUNT * sample_size:
+            return 1.0
+        step = (len(seed) - sample_size) // (SAMPLE_COUNT - 1)
+        found = 0
+        for sample in range(SAMPLE_COUNT):
+            start = sample * step
+            matches = self.scan(seed, start, start + sample_size, max_rolling=sample_size)
+            found += sum(1 for _ in matches)
+        return found * blocksize / (SAMPLE_COUNT * sample_size)
+
+    def match_seed(self, target) -> list:
+        """Copy every block found in the seed into target, returns which blocks are known
+
+        Nothing is copied when samples of the seed show too little in common with
+        the new file for a delta to be worth it.
+        """
+        control = self.control
+        blocksize = control.blocksize
+        known = [False] * control.block_count
+        if os.path.getsize(self.seed_path) < blocksize:
+            return known
+        seed_name = os.path.basename(self.seed_path)
+        with open(self.seed_path, 'rb') as f:
+            seed = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with seed:
+            reuse = self.estimate_reuse(seed)
+            if reuse < 1 - MAX_DELTA_FRACTION:
+                logger.info(f"Only {reuse:.0%} of sampled {seed_name} found in the new file")
+                return known
+            for x, matches in self.scan(seed, 0, len(seed), MAX_ROLLING_BYTES):
+                block = None
+                for index in matches:
+                    if known[index]:
+                        continue
+                    if block is None:
+                        block = seed[x:x + blocksize]
+                    target.seek(index * blocksize)
+                    target.write(block[:control.length - index * blocksize])
+                    known[index] = True
+        return known
+
+    def missing_ranges(self, known: list) -> list:
+        """Byte ranges of unknown blocks, close ranges merged to save requests"""
+        blocksize = self.control.blocksize
+        ranges = []
+        for index, is_known in enumerate(known):
+            if is_known:
+                continue
+            start = index * blocksize
+            end = min(start + blocksize, self.control.length) - 1
+            if ranges and start - ranges[-1][1] - 1 <= RANGE_MERGE_GAP_BLOCKS * blocksize:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return ranges
+
+    def run(self, session) -> bool:
+        """Build the file, returns False when a delta is not worth it and nothing was changed"""
+        with open(self.part_path, 'wb') as target:
+            target.truncate(self.control.length)
+            known = self.match_seed(target)
+            ranges = self.missing_ranges(known)
+            missing = sum(end - start + 1 for start, end in ranges)
+            logger.info(
+                f"zsync reused {known.count(True)} of {len(known)} blocks "
+                f"from {os.path.basename(self.seed_path)}, "
+                f"fetching {missing} of {self.control.length} bytes"
+            )
+            if missing > self.control.length * MAX_DELTA_FRACTION:
+                target.close()
+                os.remove(self.part_path)
+                return False
+
+            for start, end in ranges:
+                self.fetch_range(session, target, start, end)
+
+        if self.control.sha1:
+            sha1 = hashlib.sha1()
+            with open(self.part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(chunk)
+            if sha1.hexdigest() != self.control.sha1:
+                os.remove(self.part_path)
+                filename = os.path.basename(self.full_path)
+                raise ValueError(f"zsync result does not match SHA-1 for {filename}")
+        os.replace(self.part_path, self.full_path)
+        return True
+
+    def fetch_range(self, session, target, start: int, end: int):
+        from src.downloads import CHUNK_SIZE, parse_content_range
+
+        headers = {'Range': f'bytes={start}-{end}'}
+        response = session.get(self.url, stream=True, headers=headers, timeout=30)
+        response.raise_for_status()
+        if response.status_code != 206:
+            response.close()
+            raise ValueError("Server does not support range requests")
+        range_start, _, _ = parse_content_range(response.headers.get('Content-Range'))
+        if range_start != start:
+            raise ValueError(f"Server returned range starting at {range_start} instead of {start}")
+        target.seek(start)
+        with response:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                target.write(chunk)
+                self.fetched_bytes += len(chunk)
@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import asyncengine
+
+CONTENT = b'AppImage v1.1.0' * 1024
+ASSET_NAME = 'App-1.1.0-x86_64.AppImage'
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Serves an empty GraphQL result, the latest release of owner/app and its asset"""
+    api_status = 200
+
+    def do_POST(self):
+        self.reply(200, 'application/json', json.dumps({'data': {}}).encode())
+
+    def do_GET(self):
+        base_url = f'http://127.0.0.1:{self.server.server_port}'
+        if self.path.startswith('/repos/') and type(self).api_status != 200:
+            self.reply(type(self).api_status, 'application/json', b'{}')
+        elif self.path == '/repos/owner/app/releases/latest':
+            release = {
+                'name': 'v1.1.0', 'tag_name': 'v1.1.0',
+                'html_url': 'https://github.com/owner/app/releases/v1.1.0',
+                'published_at': '2024-01-01T00:00:00Z',
+                'assets': [{
+                    'id': 1, 'name': ASSET_NAME, 'size': len(CONTENT),
+                    'browser_download_url': f'{base_url}/download/{ASSET_NAME}',
+                    'updated_at': '2024-01-01T00:00:00Z',
+                    'digest': 'sha256:' + hashlib.sha256(CONTENT).hexdigest()
+                }]
+            }
+            self.reply(200, 'application/json', json.dumps(release).encode())
+        elif self.path == f'/download/{ASSET_NAME}':
+            self.reply(200, 'application/octet-stream', CONTENT)
+        else:
+            self.reply(404, 'text/plain', b'')
+
+    def reply(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url(monkeypatch, tmp_path):
+    FakeGitHub.api_status = 200
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    monkeypatch.setattr(asyncengine, 'API_URL', url)
+    monkeypatch.setattr(asyncengine, 'GRAPHQL_URL', f'{url}/graphql')
+    monkeypatch.setattr(asyncengine, 'get_config_dir', lambda: str(tmp_path))
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_headless_run_installs_with_the_shared_downloader(server_url, tmp_path):
+    install_dir = tmp_path / 'apps'
+    repos_path = tmp_path / 'repos.json'
+    repos_path.write_text(json.dumps({'repos': [
+        {'name': 'broken', 'url': 'not a url', 'path': str(install_dir),
+         'version': '', 'auto_update': True},
+        {'name': 'owner/app', 'url': 'https://github.com/owner/app', 'path': str(install_dir),
+         'version': '1.0.0', 'auto_update': True},
+    ]}))
+
+    engine = asyncengine.AsyncUpdateEngine('token', str(repos_path))
+    engine.current_os = 'linux'
+
+    # The malformed URL is skipped, the other repository still updates
+    assert asyncio.run(engine.run()) == 0
+    assert (install_dir / ASSET_NAME).read_bytes() == CONTENT
+    assert engine.repo_store.get('owner/app')['version'] == '1.1.0'
+
+
+def test_stored_release_is_used_when_the_lookup_fails(server_url, tmp_path):
+    install_dir = tmp_path / 'apps'
+    repos_path = tmp_path / 'repos.json'
+    repos_path.write_text(json.dumps({'repos': [
+        {'name': 'owner/app', 'url': 'https://github.com/owner/app', 'path': str(install_dir),
+         'version': '1.1.0', 'auto_update': True},
+    ]}))
+    engine = asyncengine.AsyncUpdateEngine('token', str(repos_path))
+    engine.current_os = 'linux'
+    assert asyncio.run(engine.run()) == 0
+    assert not install_dir.exists()
+
+    FakeGitHub.api_status = 403
+    engine.repo_store.update('owner/app', version='1.0.0')
+    assert asyncio.run(engine.run()) == 0
+    assert (install_dir / ASSET_NAME).read_bytes() == CONTENT
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.blobcache import BlobCache
+from src.downloads import Downloader
+
+CONTENT = os.urandom(256 * 1024)
+ETAG = '"asset-v1"'
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves CONTENT and honours Range requests like the GitHub asset CDN"""
+
+    def do_GET(self):
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', ETAG) == ETAG:
+            start = int(range_header.split('=')[1].split('-')[0])
+        body = CONTENT[start:]
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def asset_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/app.bin'
+    server.shutdown()
+    server.server_close()
+
+
+def test_resumed_download_is_cached_under_its_full_digest(tmp_path, asset_url):
+    install_dir = tmp_path / 'install'
+    install_dir.mkdir()
+    full_path = install_dir / 'app.bin'
+    # Left behind by an interrupted attempt
+    (install_dir / 'app.bin.part').write_bytes(CONTENT[:100 * 1024])
+    (install_dir / 'app.bin.part.json').write_text(json.dumps({
+        'url': asset_url, 'etag': ETAG, 'last_modified': None, 'total_size': len(CONTENT)
+    }))
+    blob_cache = BlobCache(str(tmp_path / 'cache'))
+
+    Downloader(asset_url, str(install_dir), segment_threshold=0, blob_cache=blob_cache).run()
+
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    assert full_path.read_bytes() == CONTENT
+    assert blob_cache.lookup(asset_url) == os.path.join(blob_cache.blob_dir, sha256)
+    assert blob_cache.lookup(asset_url, sha256) is not None
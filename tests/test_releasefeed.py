@@ -0,0 +1,107 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import githubAuth
+
+REPO_URL = 'https://github.com/owner/app'
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <id>tag:github.com,2008:https://github.com/owner/app/releases</id>
+  <title>Release notes from app</title>
+  <entry>
+    <id>tag:github.com,2008:Repository/1/{tag}</id>
+    <updated>{updated}</updated>
+    <title>{tag}</title>
+  </entry>
+</feed>
+"""
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Serves the releases.atom feed and the latest release API of one repository"""
+    tag = 'v1.0.0'
+    updated = '2024-01-01T00:00:00Z'
+    feed_status = 200
+    api_requests = 0
+
+    def do_GET(self):
+        cls = type(self)
+        if self.path == '/owner/app/releases.atom':
+            body = FEED_TEMPLATE.format(tag=cls.tag, updated=cls.updated).encode()
+            self.reply(cls.feed_status, 'application/atom+xml', body)
+        elif self.path == '/repos/owner/app/releases/latest':
+            cls.api_requests += 1
+            release = {
+                'name': cls.tag, 'tag_name': cls.tag, 'html_url': f'{REPO_URL}/releases/{cls.tag}',
+                'published_at': cls.updated, 'assets': []
+            }
+            self.reply(200, 'application/json', json.dumps(release).encode())
+        else:
+            self.reply(404, 'text/plain', b'')
+
+    def reply(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url(monkeypatch, tmp_path):
+    FakeGitHub.tag, FakeGitHub.updated = 'v1.0.0', '2024-01-01T00:00:00Z'
+    FakeGitHub.feed_status, FakeGitHub.api_requests = 200, 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    monkeypatch.setattr(githubAuth, 'API_URL', url)
+    monkeypatch.setattr(githubAuth, 'get_config_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(githubAuth, 'load_github_token', lambda: 'token')
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def latest_tag(server_url: str) -> str:
+    """Look the release up like a new run of the app, with empty in-memory caches"""
+    git = githubAuth.GitHub()
+    git.enable_release_feed(base_url=server_url)
+    return git.get_latest_release_url(REPO_URL).tag_name
+
+
+def test_release_feed_skips_the_api_while_unchanged(server_url):
+    # First sight of the feed
+    assert latest_tag(server_url) == 'v1.0.0'
+    assert FakeGitHub.api_requests == 1
+
+    # Unchanged feed, the release remembered by the last run is used
+    assert latest_tag(server_url) == 'v1.0.0'
+    assert FakeGitHub.api_requests == 1
+
+    # New entry
+    FakeGitHub.tag, FakeGitHub.updated = 'v1.1.0', '2024-02-01T00:00:00Z'
+    assert latest_tag(server_url) == 'v1.1.0'
+    assert FakeGitHub.api_requests == 2
+
+    assert latest_tag(server_url) == 'v1.1.0'
+    assert FakeGitHub.api_requests == 2
+
+
+def test_feed_error_falls_back_to_the_api(server_url):
+    assert latest_tag(server_url) == 'v1.0.0'
+    FakeGitHub.feed_status = 500
+
+    assert latest_tag(server_url) == 'v1.0.0'
+    assert FakeGitHub.api_requests == 2
+
+    # The failed read dropped the remembered entry, so a working feed starts over
+    FakeGitHub.feed_status = 200
+    assert latest_tag(server_url) == 'v1.0.0'
+    assert FakeGitHub.api_requests == 3
@@ -0,0 +1,101 @@
+import json
+
+from src.releases import Release
+from src.repostore import RepoStore
+from src.statedb import StateDatabase
+
+
+def make_repo(name):
+    return {'name': name, 'url': f'https://github.com/owner/{name}', 'version': '1.0'}
+
+
+def test_switching_backends_carries_changes_over(tmp_path):
+    repos_path = str(tmp_path / 'repos.json')
+    db_path = str(tmp_path / 'state.db')
+    (tmp_path / 'repos.json').write_text(json.dumps({'repos': [make_repo('one')]}))
+
+    db = StateDatabase(db_path, import_path=repos_path)
+    assert [repo['name'] for repo in db.repos()] == ['one']
+    db.add(make_repo('two'))
+    db.update('one', version='2.0')
+    db.export_json(repos_path)
+    db.close()
+
+    store = RepoStore(repos_path)
+    assert [repo['name'] for repo in store.repos()] == ['one', 'two']
+    assert store.get('one')['version'] == '2.0'
+    store.remove('two')
+    store.flush()
+
+    db = StateDatabase(db_path, import_path=repos_path)
+    assert [repo['name'] for repo in db.repos()] == ['one']
+    db.close()
+
+
+def test_unchanged_repos_json_is_not_imported_again(tmp_path):
+    repos_path = str(tmp_path / 'repos.json')
+    db_path = str(tmp_path / 'state.db')
+    (tmp_path / 'repos.json').write_text(json.dumps({'repos': [make_repo('one')]}))
+
+    db = StateDatabase(db_path, import_path=repos_path)
+    db.add(make_repo('two'))
+    db.close()
+
+    db = StateDatabase(db_path, import_path=repos_path)
+    assert [repo['name'] for repo in db.repos()] == ['one', 'two']
+    db.close()
+
+
+def test_url_index_follows_changes(tmp_path):
+    stores = (RepoStore(str(tmp_path / 'repos.json')), StateDatabase(str(tmp_path / 'state.db')))
+    for store in stores:
+        store.add(make_repo('one'))
+        store.update('one', url='https://github.com/owner/moved')
+        assert store.get_by_url('https://github.com/owner/one') is None
+        assert store.get_by_url('https://github.com/owner/moved')['name'] == 'one'
+        store.remove('one')
+        assert store.get_by_url('https://github.com/owner/moved') is None
+        store.close()
+
+
+def test_unexported_changes_are_not_overwritten(tmp_path):
+    repos_path = tmp_path / 'repos.json'
+    db_path = str(tmp_path / 'state.db')
+    repos_path.write_text(json.dumps({'repos': [make_repo('one')]}))
+
+    db = StateDatabase(db_path, import_path=str(repos_path))
+    db.add(make_repo('two'))
+    db.close()
+
+    # Edited file
+    repos_path.write_text(json.dumps({'repos': [make_repo('three')]}))
+    db = StateDatabase(db_path, import_path=str(repos_path))
+    assert [repo['name'] for repo in db.repos()] == ['one', 'two']
+    db.close()
+
+    # Deleted file
+    repos_path.unlink()
+    db = StateDatabase(db_path, import_path=str(repos_path))
+    assert [repo['name'] for repo in db.repos()] == ['one', 'two']
+    db.close()
+
+
+def test_release_is_kept_for_later_runs(tmp_path):
+    db_path = str(tmp_path / 'state.db')
+    release = Release.from_rest({
+        'name': 'v1.1.0', 'tag_name': 'v1.1.0', 'published_at': '2024-01-01T00:00:00Z',
+        'assets': [{'name': 'App-1.1.0.AppImage', 'browser_download_url': 'https://example.com'}]
+    })
+    db = StateDatabase(db_path)
+    db.add(make_repo('one'))
+    db.save_release('https://github.com/owner/one', release)
+    db.close()
+
+    db = StateDatabase(db_path)
+    stored = db.get_release('https://github.com/owner/one')
+    assert stored.tag_name == 'v1.1.0'
+    assert [asset.name for asset in stored.get_assets()] == ['App-1.1.0.AppImage']
+    assert db.get_release('https://github.com/owner/one', max_age=-1) is None
+    db.remove('one')
+    assert db.get_release('https://github.com/owner/one') is None
+    db.close()
@@ -0,0 +1,65 @@
+import os
+import random
+
+from src.zsync import ZsyncControl, ZsyncDelta, find_seed_file, md4, rsum
+
+BLOCKSIZE = 2048
+
+
+def make_control(data: bytes, rsum_bytes: int = 3, checksum_bytes: int = 5) -> ZsyncControl:
+    """Build the .zsync control file zsyncmake would publish for data"""
+    body = bytearray()
+    for start in range(0, len(data), BLOCKSIZE):
+        block = data[start:start + BLOCKSIZE].ljust(BLOCKSIZE, b'\x00')
+        a, b = rsum(block)
+        body += (((a << 16) | b) & ((1 << (8 * rsum_bytes)) - 1)).to_bytes(rsum_bytes, 'big')
+        body += md4(block)[:checksum_bytes]
+    header = (
+        f'zsync: 0.6.2\nBlocksize: {BLOCKSIZE}\nLength: {len(data)}\n'
+        f'Hash-Lengths: 2,{rsum_bytes},{checksum_bytes}\n\n'
+    )
+    return ZsyncControl(header.encode() + bytes(body))
+
+
+def match(tmp_path, seed: bytes, new: bytes) -> list:
+    seed_path = tmp_path / 'seed.AppImage'
+    seed_path.write_bytes(seed)
+    control = make_control(new)
+    url = 'http://localhost/new.AppImage'
+    delta = ZsyncDelta(control, url, str(seed_path), str(tmp_path / 'new'))
+    with open(tmp_path / 'new.part', 'wb') as target:
+        target.truncate(len(new))
+        known = delta.match_seed(target)
+    content = (tmp_path / 'new.part').read_bytes()
+    for index, is_known in enumerate(known):
+        block = slice(index * BLOCKSIZE, (index + 1) * BLOCKSIZE)
+        if is_known:
+            assert content[block] == new[block]
+    return known
+
+
+def test_blocks_are_found_after_an_insertion(tmp_path):
+    rng = random.Random(1)
+    seed = rng.randbytes(256 * BLOCKSIZE)
+    new = b'header' + seed[:len(seed) // 2] + rng.randbytes(5000) + seed[len(seed) // 2:]
+
+    known = match(tmp_path, seed, new)
+
+    assert known.count(True) >= len(known) - 6
+
+
+def test_unrelated_seed_is_rejected_by_sampling(tmp_path):
+    rng = random.Random(2)
+    known = match(tmp_path, rng.randbytes(1024 * BLOCKSIZE), rng.randbytes(1024 * BLOCKSIZE))
+
+    assert not any(known)
+
+
+def test_seed_file_belongs_to_the_same_app(tmp_path):
+    (tmp_path / 'Other-2.0-x86_64.AppImage').write_bytes(b'other')
+    assert find_seed_file(str(tmp_path), 'MyApp-1.1.0-x86_64.AppImage') is None
+
+    installed = tmp_path / 'MyApp-1.0.0-x86_64.AppImage'
+    installed.write_bytes(b'old')
+    os.utime(installed, (0, 0))
+    assert find_seed_file(str(tmp_path), 'MyApp-1.1.0-x86_64.AppImage') == str(installed)